@@ -0,0 +1,221 @@
+use std::{
+    sync::{
+        atomic::{AtomicU64, Ordering},
+        Arc, Mutex, PoisonError,
+    },
+};
+use axum::{
+    body::{self, Body},
+    extract::{Request, State},
+    http::{header, HeaderValue, Method, StatusCode},
+    middleware::Next,
+    response::{IntoResponse, Response},
+};
+use bytes::Bytes;
+use dashmap::DashMap;
+use tracing::{debug, error};
+use crate::AppState;
+
+/// Upper bound on cached request URIs so arbitrary query strings can't grow the cache
+/// unbounded
+const MAX_CACHED_RESPONSES: usize = 1024;
+
+/// Upper bound on the body bytes held, since one running-total response can be ~1 MB
+const MAX_CACHED_BYTES: usize = 64 * 1024 * 1024;
+
+struct CachedResponse {
+    body: Bytes,
+    etag: HeaderValue,
+    /// Data epoch the body was built against
+    epoch: u64,
+    /// Clock tick of the last store or hit, for least-recently-used eviction
+    last_used: AtomicU64,
+}
+
+/// Serialized JSON responses keyed by request URI (path and query string). Entries
+/// stay valid until the precomputed data changes and `clear` is called. Once either
+/// limit is reached, the least recently used entries make room for new ones.
+pub struct ResponseCache {
+    entries: DashMap<String, CachedResponse>,
+    /// Bumped by every `clear`. Entries built against an older epoch are never served.
+    epoch: AtomicU64,
+    /// Source of `last_used` ticks
+    clock: AtomicU64,
+    /// Body bytes held. The lock also serializes inserts with `clear`, so an insert
+    /// that passed the epoch check can't land after the entries were dropped.
+    used_bytes: Mutex<usize>,
+    max_entries: usize,
+    max_bytes: usize,
+}
+
+impl ResponseCache {
+    pub fn new() -> Self {
+        Self::with_limits(MAX_CACHED_RESPONSES, MAX_CACHED_BYTES)
+    }
+
+    pub fn with_limits(max_entries: usize, max_bytes: usize) -> Self {
+        Self {
+            entries: DashMap::new(),
+            epoch: AtomicU64::new(0),
+            clock: AtomicU64::new(0),
+            used_bytes: Mutex::new(0),
+            max_entries,
+            max_bytes,
+        }
+    }
+
+    /// Returns the cached body and its ETag if it was built from the current data
+    pub fn get(&self, key: &str) -> Option<(Bytes, HeaderValue)> {
+        let entry = self.entries.get(key)?;
+        if entry.epoch != self.epoch() {
+            return None;
+        }
+        entry.last_used.store(self.tick(), Ordering::Relaxed);
+        Some((entry.body.clone(), entry.etag.clone()))
+    }
+
+    /// Current data epoch, taken before computing a response that will be inserted
+    pub fn epoch(&self) -> u64 {
+        self.epoch.load(Ordering::Acquire)
+    }
+
+    pub fn clear(&self) {
+        let mut used_bytes = self.used_bytes.lock().unwrap_or_else(PoisonError::into_inner);
+        self.epoch.fetch_add(1, Ordering::AcqRel);
+        self.entries.clear();
+        *used_bytes = 0;
+    }
+
+    /// Moves to a new epoch without dropping entries, as if a `clear` had raced with
+    /// the inserts before it
+    #[cfg(test)]
+    pub(crate) fn advance_epoch(&self) {
+        self.epoch.fetch_add(1, Ordering::AcqRel);
+    }
+
+    /// Caches `body` under `key` if the data has not changed since `epoch`, and
+    /// returns the ETag it is served with
+    pub fn insert(&self, key: String, body: Bytes, epoch: u64) -> HeaderValue {
+        let etag = etag_for(&body);
+        if body.len() > self.max_bytes {
+            return etag;
+        }
+
+        let mut used_bytes = self.used_bytes.lock().unwrap_or_else(PoisonError::into_inner);
+        // Skip caching if the response was built from replaced data
+        if self.epoch() != epoch {
+            return etag;
+        }
+
+        if let Some((_, replaced)) = self.entries.remove(&key) {
+            *used_bytes -= replaced.body.len();
+        }
+        while self.entries.len() >= self.max_entries || *used_bytes + body.len() > self.max_bytes {
+            let Some(victim) = self.least_recently_used() else {
+                break;
+            };
+            if let Some((_, evicted)) = self.entries.remove(&victim) {
+                debug!("Evicting cached response for {}", victim);
+                *used_bytes -= evicted.body.len();
+            }
+        }
+
+        *used_bytes += body.len();
+        self.entries.insert(key, CachedResponse {
+            body,
+            etag: etag.clone(),
+            epoch,
+            last_used: AtomicU64::new(self.tick()),
+        });
+        etag
+    }
+
+    fn tick(&self) -> u64 {
+        self.clock.fetch_add(1, Ordering::Relaxed)
+    }
+
+    fn least_recently_used(&self) -> Option<String> {
+        self.entries
+            .iter()
+            .min_by_key(|entry| entry.last_used.load(Ordering::Relaxed))
+            .map(|entry| entry.key().clone())
+    }
+}
+
+/// Strong validator derived from the response body, so identical data keeps the same
+/// tag across refreshes. FNV-1a is fixed by definition, unlike the std hasher, so tags
+/// also survive restarts and upgrades of the server.
+fn etag_for(body: &[u8]) -> HeaderValue {
+    let hash = body.iter().fold(0xcbf2_9ce4_8422_2325u64, |hash, &byte| {
+        (hash ^ u64::from(byte)).wrapping_mul(0x0000_0100_0000_01b3)
+    });
+    HeaderValue::from_str(&format!("\"{:016x}\"", hash))
+        .expect("hex digest is a valid header value")
+}
+
+/// Whether an If-None-Match header lists `etag` (or `*`)
+pub fn etag_matches(if_none_match: Option<&HeaderValue>, etag: &HeaderValue) -> bool {
+    let (Some(if_none_match), Ok(etag)) = (if_none_match.and_then(|v| v.to_str().ok()), etag.to_str()) else {
+        return false;
+    };
+    if_none_match
+        .split(',')
+        .map(|candidate| candidate.trim().trim_start_matches("W/"))
+        .any(|candidate| candidate == etag || candidate == "*")
+}
+
+/// Bodiless reply telling the client its copy is still current
+fn not_modified(etag: HeaderValue) -> Response {
+    (StatusCode::NOT_MODIFIED, [(header::ETAG, etag)]).into_response()
+}
+
+/// Middleware that memoizes successful GET responses until the precomputed data they
+/// were built from changes. Responses carry an ETag, and a matching If-None-Match is
+/// answered with 304 and no body.
+pub async fn cache_responses(
+    State(state): State<Arc<AppState>>,
+    request: Request,
+    next: Next,
+) -> Response {
+    if request.method() != Method::GET {
+        return next.run(request).await;
+    }
+
+    let key = request.uri().to_string();
+    let if_none_match = request.headers().get(header::IF_NONE_MATCH).cloned();
+    if let Some((body, etag)) = state.responses.get(&key) {
+        if etag_matches(if_none_match.as_ref(), &etag) {
+            debug!("Cached response for {} not modified", key);
+            return not_modified(etag);
+        }
+        debug!("Serving cached response for {}", key);
+        return (
+            [(header::CONTENT_TYPE, HeaderValue::from_static("application/json")), (header::ETAG, etag)],
+            body,
+        ).into_response();
+    }
+
+    let epoch = state.responses.epoch();
+    let response = next.run(request).await;
+    if response.status() != StatusCode::OK {
+        return response;
+    }
+
+    let (parts, body) = response.into_parts();
+    let bytes = match body::to_bytes(body, usize::MAX).await {
+        Ok(bytes) => bytes,
+        Err(e) => {
+            error!("Failed to buffer response body for {}: {}", key, e);
+            return StatusCode::INTERNAL_SERVER_ERROR.into_response();
+        }
+    };
+
+    let etag = state.responses.insert(key, bytes.clone(), epoch);
+    if etag_matches(if_none_match.as_ref(), &etag) {
+        return not_modified(etag);
+    }
+
+    let mut response = Response::from_parts(parts, Body::from(bytes));
+    response.headers_mut().insert(header::ETAG, etag);
+    response
+}
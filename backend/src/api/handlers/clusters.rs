@@ -17,7 +17,6 @@ use crate::{
     MonthlyClusterQuery, MonthlyData, ClusterMonthlyResponse,
     ClusterNonZero, ClusterNonZeroQuery, ClusterNonZeroResponse
 };
-use object_store::path::Path;
 
 
 pub fn get_cluster_name(pool_address: &str) -> Option<&'static str> {
@@ -53,18 +52,7 @@ pub async fn get_cluster_proportion(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/clusters/proportions.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed cluster distribution data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed cluster data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/clusters/proportions.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -157,18 +145,7 @@ pub async fn get_cluster_histogram(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/clusters/histograms.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed cluster distribution data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed distribution data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/clusters/histograms.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -264,18 +241,7 @@ pub async fn get_monthly_cluster_totals(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/clusters/monthly_totals.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed monthly distribution data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed monthly data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/clusters/monthly_totals.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -380,18 +346,7 @@ pub async fn get_cluster_non_zero(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/clusters/non_zero.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed cluster activity data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed activity data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/clusters/non_zero.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -1,29 +1,47 @@
 use arrow::array::{StringArray, UInt64Array, Float64Array, Array, Int64Array};
 use arrow::record_batch::RecordBatch;
-use axum::http::StatusCode;
+use axum::{
+    http::{header, StatusCode},
+    response::{IntoResponse, Response},
+};
+use serde::Serialize;
 use tracing::error;
 use std::collections::HashSet;
-use crate::{POOL_NAMES, POOL_ADDRESSES};
+use crate::{POOL_NAMES_LOWERCASE, VALID_POOLS};
 use arrow::datatypes::DataType;
 
 pub const BLOCKS_PER_INTERVAL: u64 = 7200;
 pub const FINAL_PARTIAL_BLOCKS: u64 = 5808;
 pub const FINAL_INTERVAL_FILE: &str = "19857392_20000000.parquet";
 
-pub fn get_valid_pools() -> HashSet<String> {
-    POOL_ADDRESSES.iter()
-        .map(|&addr| addr.to_lowercase())
-        .collect()
+pub fn get_valid_pools() -> &'static HashSet<String> {
+    &VALID_POOLS
 }
 
 pub fn get_pool_name(pool_address: &str) -> String {
-    POOL_NAMES
-        .iter()
-        .find(|(addr, _)| addr.to_lowercase() == pool_address)
-        .map(|(_, name)| name.to_string())
+    POOL_NAMES_LOWERCASE
+        .get(pool_address)
+        .map(|name| name.to_string())
         .unwrap_or_else(|| pool_address.to_string())
 }
 
+/// Serializes `value` into a buffer pre-sized to `capacity` bytes. Large responses
+/// skip the repeated regrowth of axum's small default JSON buffer.
+pub fn json_response<T: Serialize>(value: &T, capacity: usize) -> Result<Response, StatusCode> {
+    let mut buffer = Vec::with_capacity(capacity);
+    serde_json::to_writer(&mut buffer, value).map_err(|e| {
+        error!("Failed to serialize response: {}", e);
+        StatusCode::INTERNAL_SERVER_ERROR
+    })?;
+
+    Ok(([(header::CONTENT_TYPE, "application/json")], buffer).into_response())
+}
+
+/// Orders rows largest first by `key`; the sort is stable, so ties keep file order
+pub fn sort_descending_by<T>(rows: &mut [T], key: impl Fn(&T) -> u64) {
+    rows.sort_by(|a, b| key(b).cmp(&key(a)));
+}
+
 pub fn calculate_block_number(base_block: u64, interval_id: u64, file_path: &str) -> u64 {
     let file_start = file_path
         .split("intervals/")
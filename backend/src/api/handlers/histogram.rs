@@ -11,7 +11,6 @@ use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
 use arrow::array::{Int64Array,UInt64Array, Array};
 use arrow::datatypes::DataType;
-use object_store::path::Path;
 
 pub async fn get_lvr_histogram(
     State(state): State<Arc<AppState>>,
@@ -33,18 +32,7 @@ pub async fn get_lvr_histogram(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/distributions/histograms.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed histogram data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed histogram data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/distributions/histograms.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -74,7 +62,7 @@ pub async fn get_lvr_histogram(
 
         for i in 0..batch.num_rows() {
             // Early filtering
-            if pool_addresses.value(i).to_lowercase() != pool_address ||
+            if !pool_addresses.value(i).eq_ignore_ascii_case(&pool_address) ||
                markout_times.value(i) != markout_time {
                 continue;
             }
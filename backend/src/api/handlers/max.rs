@@ -1,39 +1,30 @@
 use axum::{
     extract::{State, Query},
-    response::Json,
     http::StatusCode,
+    response::Response,
 };
 use crate::{AppState, 
     MaxLVRResponse, MaxLVRQuery, MaxLVRPoolData,
     api::handlers::common::{get_uint64_column, 
-    get_string_column}};
+    get_string_column, json_response, sort_descending_by}};
 use tracing::{error, info, warn};
 use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
 use object_store::ObjectStore;
-use object_store::path::Path;
+
+// Upper estimate of one serialized pool entry, used to size the response buffer
+const MAX_LVR_ROW_BYTES: usize = 160;
 
 pub async fn get_max_lvr(
     State(state): State<Arc<AppState>>,
     Query(params): Query<MaxLVRQuery>,
-) -> Result<Json<MaxLVRResponse>, StatusCode> {
+) -> Result<Response, StatusCode> {
     let markout_time = params.markout_time;
     
     info!("Fetching maximum LVR values for markout_time: {}", markout_time);
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/pool_metrics/max_lvr.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed max LVR data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed max LVR data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/pool_metrics/max_lvr.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -84,7 +75,7 @@ pub async fn get_max_lvr(
     }
 
     // Sort by LVR value descending for consistent ordering
-    pool_data.sort_by(|a, b| b.lvr_cents.cmp(&a.lvr_cents));
+    sort_descending_by(&mut pool_data, |pool| pool.lvr_cents);
 
     if pool_data.is_empty() {
         warn!(
@@ -101,5 +92,6 @@ pub async fn get_max_lvr(
         );
     }
 
-    Ok(Json(MaxLVRResponse { pools: pool_data }))
+    let capacity = pool_data.len() * MAX_LVR_ROW_BYTES;
+    json_response(&MaxLVRResponse { pools: pool_data }, capacity)
 }
\ No newline at end of file
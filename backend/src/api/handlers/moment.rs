@@ -11,7 +11,6 @@ use crate::{
     api::handlers::common::{get_string_column, get_float64_column, get_valid_pools},
     DistributionQuery, DistributionResponse,
 };
-use object_store::path::Path;
 
 pub async fn get_distribution_metrics(
     State(state): State<Arc<AppState>>,
@@ -33,18 +32,7 @@ pub async fn get_distribution_metrics(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/distributions/metrics.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed distribution metrics: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed metrics data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/distributions/metrics.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -95,7 +83,7 @@ pub async fn get_distribution_metrics(
             })?;
 
         for i in 0..batch.num_rows() {
-            if pool_addresses.value(i).to_lowercase() == pool_address && 
+            if pool_addresses.value(i).eq_ignore_ascii_case(&pool_address) && 
                markout_times.value(i) == markout_time {
                 
                 info!(
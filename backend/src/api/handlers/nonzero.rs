@@ -8,7 +8,6 @@ use crate::{api::handlers::common::{get_float64_column, get_string_column, get_v
 use tracing::{error, info, warn};
 use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
-use object_store::path::Path;
 
 pub async fn get_non_zero_proportion(
     State(state): State<Arc<AppState>>,
@@ -30,18 +29,7 @@ pub async fn get_non_zero_proportion(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/pool_metrics/non_zero.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed activity metrics: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed activity metrics: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/pool_metrics/non_zero.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -63,7 +51,7 @@ pub async fn get_non_zero_proportion(
         let non_zero_proportions = get_float64_column(&batch, "non_zero_proportion")?;
 
         for i in 0..batch.num_rows() {
-            if pool_addresses.value(i).to_lowercase() == pool_address && 
+            if pool_addresses.value(i).eq_ignore_ascii_case(&pool_address) && 
                markout_times.value(i) == markout_time {
                 
                 let pool_name = pool_names.value(i).to_string();
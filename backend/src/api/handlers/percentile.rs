@@ -10,7 +10,6 @@ use crate::{AppState,
 use tracing::{error, info, warn};
 use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
-use object_store::path::Path;
 
 pub async fn get_percentile_band(
     State(state): State<Arc<AppState>>,
@@ -37,18 +36,7 @@ pub async fn get_percentile_band(
         pool_filter, start_block, end_block, markout_time
     );
 
-    let bytes = state.store.get(&Path::from("precomputed/distributions/percentile_bands.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed percentile distribution data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed percentile data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/distributions/percentile_bands.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -78,7 +66,7 @@ pub async fn get_percentile_band(
         let percentile_75 = get_float64_column(&batch, "percentile_75_dollars")?;
 
         for i in 0..batch.num_rows() {
-            let current_pool = pool_addresses.value(i).to_lowercase();
+            let current_pool = pool_addresses.value(i);
             let interval_start = start_blocks.value(i);
             let interval_end = end_blocks.value(i);
             
@@ -87,7 +75,7 @@ pub async fn get_percentile_band(
                 continue;
             }
 
-            if current_pool != pool_filter || markout_times.value(i) != markout_time {
+            if !current_pool.eq_ignore_ascii_case(&pool_filter) || markout_times.value(i) != markout_time {
                 continue;
             }
 
@@ -1,37 +1,28 @@
 use axum::{
     extract::{State, Query},
-    response::Json,
     http::StatusCode,
+    response::Response,
 };
 use crate::{AppState, 
     PoolTotalsQuery, PoolTotalsResponse, PoolTotal,
-    api::handlers::common::{get_uint64_column, get_string_column}};
+    api::handlers::common::{get_uint64_column, get_string_column, json_response, sort_descending_by}};
 use tracing::{error, info, warn};
 use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
-use object_store::path::Path;
+
+// Upper estimate of one serialized pool total, used to size the response buffer
+const POOL_TOTAL_ROW_BYTES: usize = 128;
 
 pub async fn get_pool_totals(
     State(state): State<Arc<AppState>>,
     Query(params): Query<PoolTotalsQuery>,
-) -> Result<Json<PoolTotalsResponse>, StatusCode> {
+) -> Result<Response, StatusCode> {
     let markout_time = params.markout_time.unwrap_or_else(|| String::from("brontes"));
     
     info!("Fetching pool performance metrics for markout_time: {}", markout_time);
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/pool_metrics/totals.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed pool totals: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed pool totals: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/pool_metrics/totals.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -75,7 +66,7 @@ pub async fn get_pool_totals(
     }
 
     // Sort by total LVR cents descending for consistent ordering
-    pool_totals.sort_by(|a, b| b.total_lvr_cents.cmp(&a.total_lvr_cents));
+    sort_descending_by(&mut pool_totals, |pool| pool.total_lvr_cents);
 
     if pool_totals.is_empty() {
         warn!(
@@ -91,5 +82,6 @@ pub async fn get_pool_totals(
         );
     }
 
-    Ok(Json(PoolTotalsResponse { totals: pool_totals }))
+    let capacity = pool_totals.len() * POOL_TOTAL_ROW_BYTES;
+    json_response(&PoolTotalsResponse { totals: pool_totals }, capacity)
 }
\ No newline at end of file
@@ -11,7 +11,6 @@ use crate::{
 use tracing::{error, info, warn};
 use std::sync::Arc;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
-use object_store::path::Path;
 
 pub async fn get_quartile_plot(
     State(state): State<Arc<AppState>>,
@@ -33,18 +32,7 @@ pub async fn get_quartile_plot(
     );
 
     // Read from precomputed file
-    let bytes = state.store.get(&Path::from("precomputed/distributions/quartile_plots.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed quartile metrics: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed quartile data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    let bytes = state.read_precomputed("precomputed/distributions/quartile_plots.parquet").await?;
 
     let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
         .map_err(|e| {
@@ -66,10 +54,10 @@ pub async fn get_quartile_plot(
         let percentile_75 = get_uint64_column(&batch, "percentile_75_cents")?;
 
         for i in 0..batch.num_rows() {
-            let current_pool = pool_addresses.value(i).to_lowercase();
+            let current_pool = pool_addresses.value(i);
             
             // Filter by pool and markout time
-            if current_pool != pool_address || markout_times.value(i) != markout_time {
+            if !current_pool.eq_ignore_ascii_case(&pool_address) || markout_times.value(i) != markout_time {
                 continue;
             }
 
@@ -84,7 +72,7 @@ pub async fn get_quartile_plot(
 
             return Ok(Json(QuartilePlotResponse {
                 pool_name: pool_names.value(i).to_string(),
-                pool_address: current_pool,
+                pool_address: current_pool.to_lowercase(),
                 markout_time,
                 percentile_25_cents: percentile_25.value(i),
                 median_cents: median.value(i),
@@ -1,24 +1,34 @@
 use axum::{
     extract::{State, Query},
-    response::Json,
+    response::Response,
     http::StatusCode,
 };
 use crate::{AppState, 
-    TimeRangeQuery, RunningTotal, 
+    TimeRangeQuery, RunningTotal, RunningTotalColumns, 
     MERGE_BLOCK, api::handlers::common::{get_uint64_column, get_valid_pools, get_pool_name,
-    get_string_column}};
-use tracing::{error, info, warn};
-use std::sync::Arc;
-use parquet::arrow::arrow_reader::ParquetRecordBatchReader;
-use object_store::path::Path;
+    get_string_column, json_response}};
+use tracing::{info, warn};
+use std::{cmp::Ordering, sync::Arc};
+
+// Upper estimates of one serialized data point, used to size the response buffer
+const RUNNING_TOTAL_ROW_BYTES: usize = 160;
+const RUNNING_TOTAL_COLUMN_BYTES: usize = 80;
 
 pub async fn get_running_total(
     State(state): State<Arc<AppState>>,
     Query(params): Query<TimeRangeQuery>,
-) -> Result<Json<Vec<RunningTotal>>, StatusCode> {
+) -> Result<Response, StatusCode> {
     let start_block = params.start_block.unwrap_or(*MERGE_BLOCK - 1);
     let end_block = params.end_block.unwrap_or(20_000_000);
     let is_aggregate = params.aggregate.unwrap_or(false);
+    let columnar = match params.format.as_deref() {
+        None | Some("rows") => false,
+        Some("columns") => true,
+        Some(other) => {
+            warn!("Unsupported response format: {}", other);
+            return Err(StatusCode::BAD_REQUEST);
+        }
+    };
     
     // Early validation
     if !is_aggregate && params.pool.is_none() {
@@ -50,7 +60,13 @@ pub async fn get_running_total(
     };
 
     info!("Returning {} running total data points", results.len());
-    Ok(Json(results))
+    if columnar {
+        // Parallel arrays avoid repeating every key for every data point
+        let capacity = results.len() * RUNNING_TOTAL_COLUMN_BYTES;
+        json_response(&RunningTotalColumns::from(results), capacity)
+    } else {
+        json_response(&results, results.len() * RUNNING_TOTAL_ROW_BYTES)
+    }
 }
 
 async fn read_aggregate_running_totals(
@@ -59,72 +75,39 @@ async fn read_aggregate_running_totals(
     end_block: u64,
     markout_filter: Option<String>,
 ) -> Result<Vec<RunningTotal>, StatusCode> {
-    // Read from precomputed aggregate file
-    let bytes = state.store.get(&Path::from("precomputed/running_totals/aggregate.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed aggregate running totals: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed aggregate data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
-
-    let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
-        .map_err(|e| {
-            error!("Failed to create Parquet reader: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    // Read from precomputed aggregate file, decoded once into columns
+    let batch = state.read_precomputed_batch("precomputed/running_totals/aggregate.parquet").await?;
+
+    let block_numbers = get_uint64_column(&batch, "block_number")?;
+    let markout_times = get_string_column(&batch, "markout_time")?;
+    let running_totals = get_uint64_column(&batch, "running_total_cents")?;
 
     let mut results = Vec::new();
 
-    for batch_result in reader {
-        let batch = batch_result.map_err(|e| {
-            error!("Failed to read batch: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
-
-        let block_numbers = get_uint64_column(&batch, "block_number")?;
-        let markout_times = get_string_column(&batch, "markout_time")?;
-        let running_totals = get_uint64_column(&batch, "running_total_cents")?;
-
-        for i in 0..batch.num_rows() {
-            let block_number = block_numbers.value(i);
-            
-            // Skip if outside requested range
-            if block_number < start_block || block_number > end_block {
-                continue;
-            }
+    // The file is sorted by block, so both ends of the range are a binary search away
+    let (first_row, end_row) = block_range_rows(block_numbers.values(), start_block, end_block);
 
-            let markout_time = markout_times.value(i).to_string();
-            
-            // Apply markout time filter if specified
-            if let Some(ref filter) = markout_filter {
-                if filter != &markout_time {
-                    continue;
-                }
+    for i in first_row..end_row {
+        let block_number = block_numbers.value(i);
+        let markout_time = markout_times.value(i).to_string();
+        
+        // Apply markout time filter if specified
+        if let Some(ref filter) = markout_filter {
+            if filter != &markout_time {
+                continue;
             }
-
-            results.push(RunningTotal {
-                block_number,
-                markout: markout_time,
-                pool_name: None,
-                pool_address: None,
-                running_total_cents: running_totals.value(i),
-            });
         }
-    }
 
-    // Sort results by block number and markout time
-    results.sort_by(|a, b| {
-        a.block_number
-            .cmp(&b.block_number)
-            .then_with(|| a.markout.to_lowercase().cmp(&b.markout.to_lowercase()))
-    });
+        results.push(RunningTotal {
+            block_number,
+            markout: markout_time,
+            pool_name: None,
+            pool_address: None,
+            running_total_cents: running_totals.value(i),
+        });
+    }
 
+    results.sort_by(running_total_order);
     Ok(results)
 }
 
@@ -134,81 +117,70 @@ async fn read_individual_running_totals(
     end_block: u64,
     params: &TimeRangeQuery,
 ) -> Result<Vec<RunningTotal>, StatusCode> {
-    // Read from precomputed individual file
-    let bytes = state.store.get(&Path::from("precomputed/running_totals/individual.parquet"))
-        .await
-        .map_err(|e| {
-            error!("Failed to read precomputed individual running totals: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?
-        .bytes()
-        .await
-        .map_err(|e| {
-            error!("Failed to get bytes from precomputed individual data: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
-
-    let reader = ParquetRecordBatchReader::try_new(bytes, 1024)
-        .map_err(|e| {
-            error!("Failed to create Parquet reader: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
+    // Read from precomputed individual file, decoded once into columns
+    let batch = state.read_precomputed_batch("precomputed/running_totals/individual.parquet").await?;
+
+    let block_numbers = get_uint64_column(&batch, "block_number")?;
+    let markout_times = get_string_column(&batch, "markout_time")?;
+    let pool_addresses = get_string_column(&batch, "pool_address")?;
+    let running_totals = get_uint64_column(&batch, "running_total_cents")?;
 
     let mut results = Vec::new();
 
-    for batch_result in reader {
-        let batch = batch_result.map_err(|e| {
-            error!("Failed to read batch: {}", e);
-            StatusCode::INTERNAL_SERVER_ERROR
-        })?;
-
-        let block_numbers = get_uint64_column(&batch, "block_number")?;
-        let markout_times = get_string_column(&batch, "markout_time")?;
-        let pool_addresses = get_string_column(&batch, "pool_address")?;
-        let running_totals = get_uint64_column(&batch, "running_total_cents")?;
-
-        for i in 0..batch.num_rows() {
-            let block_number = block_numbers.value(i);
-            
-            // Skip if outside requested range
-            if block_number < start_block || block_number > end_block {
-                continue;
-            }
+    // The file is sorted by block, so both ends of the range are a binary search away
+    let (first_row, end_row) = block_range_rows(block_numbers.values(), start_block, end_block);
 
-            let markout_time = markout_times.value(i).to_string();
-            let pool_address = pool_addresses.value(i).to_lowercase();
+    for i in first_row..end_row {
+        let block_number = block_numbers.value(i);
+        let markout_time = markout_times.value(i);
+        let pool_address = pool_addresses.value(i);
 
-            // Apply markout time filter if specified
-            if let Some(ref filter) = params.markout_time {
-                if filter != &markout_time {
-                    continue;
-                }
+        // Apply markout time filter if specified
+        if let Some(ref filter) = params.markout_time {
+            if filter != markout_time {
+                continue;
             }
+        }
 
-            // Apply pool filter
-            if let Some(ref requested_pool) = params.pool {
-                if requested_pool.to_lowercase() != pool_address {
-                    continue;
-                }
+        // Apply pool filter without allocating a lowercase copy per row
+        if let Some(ref requested_pool) = params.pool {
+            if !requested_pool.eq_ignore_ascii_case(pool_address) {
+                continue;
             }
-
-            results.push(RunningTotal {
-                block_number,
-                markout: markout_time,
-                pool_name: Some(get_pool_name(&pool_address)),
-                pool_address: Some(pool_address),
-                running_total_cents: running_totals.value(i),
-            });
         }
-    }
 
-    // Sort results by block number, markout time, and pool name
-    results.sort_by(|a, b| {
-        a.block_number
-            .cmp(&b.block_number)
-            .then_with(|| a.markout.to_lowercase().cmp(&b.markout.to_lowercase()))
-            .then(a.pool_name.cmp(&b.pool_name))
-    });
+        let pool_address = pool_address.to_lowercase();
+        let markout_time = markout_time.to_string();
+        results.push(RunningTotal {
+            block_number,
+            markout: markout_time,
+            pool_name: Some(get_pool_name(&pool_address)),
+            pool_address: Some(pool_address),
+            running_total_cents: running_totals.value(i),
+        });
+    }
 
+    results.sort_by(running_total_order);
     Ok(results)
-}
\ No newline at end of file
+}
+
+/// Response order: block number, then markout time ignoring case, then pool name.
+/// Files from current precompute runs are already close to this order, so the stable
+/// sort is cheap; files written by earlier runs still come out ordered.
+fn running_total_order(a: &RunningTotal, b: &RunningTotal) -> Ordering {
+    a.block_number
+        .cmp(&b.block_number)
+        .then_with(|| {
+            let a_markout = a.markout.bytes().map(|c| c.to_ascii_lowercase());
+            a_markout.cmp(b.markout.bytes().map(|c| c.to_ascii_lowercase()))
+        })
+        .then_with(|| a.pool_name.cmp(&b.pool_name))
+}
+
+/// Returns the half-open row range holding blocks `start_block..=end_block` in a
+/// column sorted by block number
+pub fn block_range_rows(blocks: &[u64], start_block: u64, end_block: u64) -> (usize, usize) {
+    let first_row = blocks.partition_point(|&block| block < start_block);
+    let end_row = blocks.partition_point(|&block| block <= end_block);
+    (first_row, end_row.max(first_row))
+}
@@ -1,6 +1,7 @@
 mod handlers;
 mod types;
 mod state;
+pub mod cache;
 pub mod precompute;
 pub use handlers::*;
 pub use types::*;
@@ -10,6 +11,7 @@ pub use precompute::*;
 use tokio::net::TcpListener;
 use axum::{
     Router,
+    middleware,
     routing::get
 };
 use tower_http::cors::{Any, CorsLayer};
@@ -23,15 +25,15 @@ use std::time::Duration;
 pub async fn serve(host: String, port: u16, store: Arc<dyn ObjectStore>) -> Result<()> {
     // Create application state
     let state = Arc::new(AppState::new(store));
+    // Keep precomputed data current in the background so requests only read
+    state.refresh().await;
+    state.spawn_refresh();
 
-    // Configure CORS
+    // Configure CORS; every route is a read-only GET, so that is all preflights allow
     let cors = CorsLayer::new()
         .allow_origin(Any)
         .allow_methods([
             axum::http::Method::GET,
-            axum::http::Method::POST,
-            axum::http::Method::PUT,
-            axum::http::Method::DELETE,
             axum::http::Method::OPTIONS,
         ])
         .allow_headers(Any)
@@ -39,9 +41,6 @@ pub async fn serve(host: String, port: u16, store: Arc<dyn ObjectStore>) -> Resu
 
     // Build router with routes and middleware
     let app = Router::new()
-        // Core endpoints
-        .route("/health", get(health_check))
-        
         // Data analysis endpoints
         .route("/running_total", get(get_running_total))
         //.route("/regression", get(get_markout_regression))
@@ -59,6 +58,12 @@ pub async fn serve(host: String, port: u16, store: Arc<dyn ObjectStore>) -> Resu
         .route("/clusters/histogram", get(get_cluster_histogram))
         .route("/clusters/monthly", get(get_monthly_cluster_totals))
         .route("/clusters/nonzero", get(get_cluster_non_zero))
+        
+        // Memoize data responses; registered before /health so the health check stays live
+        .route_layer(middleware::from_fn_with_state(state.clone(), cache::cache_responses))
+        
+        // Core endpoints
+        .route("/health", get(health_check))
         .layer(cors)
         .with_state(state);
 
@@ -1,29 +1,37 @@
 use arrow::{
     array::{StringArray, UInt64Array, Float64Array, Int64Array},
     record_batch::RecordBatch,
-    datatypes::DataType
+    datatypes::DataType,
+    compute::kernels::cmp::gt,
 };
 use object_store::{path::Path, ObjectStore};
 use parquet::{
-    arrow::{ArrowWriter, arrow_reader::ParquetRecordBatchReader},
+    arrow::{
+        ArrowWriter, ProjectionMask,
+        arrow_reader::{ArrowPredicateFn, ParquetRecordBatchReader, ParquetRecordBatchReaderBuilder, RowFilter},
+    },
     basic::Compression,
     file::properties::WriterProperties,
 };
 use std::sync::Arc;
 use anyhow::Context;
-use std::collections::HashMap;
+use std::collections::{BTreeMap, HashMap};
 use bytes::Bytes;
 use tracing::{info, warn, debug, error};
 use futures::StreamExt;
 use crate::{
     api::handlers::*,
-    POOL_NAMES, INTERVAL_RANGES,
+    INTERVAL_RANGES,
     common::{BLOCKS_PER_INTERVAL, FINAL_INTERVAL_FILE,
         get_string_column, get_uint64_column, get_valid_pools, get_column_value, get_pool_name, get_float64_column}
 };
 use arrow::array::Array;
 
 
+/// Written last by every precompute run; the API server watches this one object to
+/// learn that the precomputed files changed
+pub const PRECOMPUTED_MANIFEST: &str = "precomputed/manifest.json";
+
 pub struct PrecomputedWriter {
     object_store: Arc<dyn ObjectStore>,
     max_retries: u32,
@@ -74,6 +82,21 @@ impl PrecomputedWriter {
         Err(anyhow::anyhow!("Failed to write after {} retries", self.max_retries))
     }
 
+    /// Marks the end of a precompute run. Call after all other outputs are written.
+    pub async fn write_manifest(&self) -> Result<(), anyhow::Error> {
+        let manifest = serde_json::json!({
+            "completed_at": chrono::Utc::now().to_rfc3339(),
+        });
+
+        self.object_store
+            .put(&Path::from(PRECOMPUTED_MANIFEST), Bytes::from(manifest.to_string()).into())
+            .await
+            .context("Failed to write precompute manifest")?;
+
+        info!("Published precompute manifest");
+        Ok(())
+    }
+
     pub async fn write_running_totals(&self) -> Result<(), anyhow::Error> {
         info!("Starting precomputation of running totals (individual and aggregate)");
         
@@ -82,8 +105,10 @@ impl PrecomputedWriter {
         let mut interval_files = self.object_store.list(Some(&intervals_path));
         let valid_pools = get_valid_pools();
             
-        let mut interval_data: HashMap<(u64, String, String), u64> = HashMap::new();
-        let mut aggregate_data: HashMap<(u64, String), u64> = HashMap::new();
+        // Ordered by (block, markout[, pool]) so the running totals can be written
+        // in a single pass without sorting
+        let mut interval_data: BTreeMap<(u64, String, String), u64> = BTreeMap::new();
+        let mut aggregate_data: BTreeMap<(u64, String), u64> = BTreeMap::new();
     
         // Process all interval files to collect interval data
         while let Some(meta_result) = interval_files.next().await {
@@ -98,7 +123,12 @@ impl PrecomputedWriter {
                 .bytes()
                 .await?;
     
-            let record_reader = ParquetRecordBatchReader::try_new(bytes, 1024)?;
+            // Only decode the columns the running totals are built from, and only for
+            // intervals that saw any LVR
+            let record_reader = Self::active_interval_reader(
+                bytes,
+                &["interval_id", "markout_time", "pair_address", "total_lvr_cents"]
+            )?;
     
             for batch_result in record_reader {
                 let batch = batch_result?;
@@ -111,11 +141,9 @@ impl PrecomputedWriter {
                     .map_err(|e| anyhow::anyhow!("Failed to get pair_address column: {}", e))?;
                 let total_lvr_cents = get_uint64_column(&batch, "total_lvr_cents")
                     .map_err(|e| anyhow::anyhow!("Failed to get total_lvr_cents column: {}", e))?;
-                let non_zero_counts = get_uint64_column(&batch, "non_zero_count")
-                    .map_err(|e| anyhow::anyhow!("Failed to get non_zero_count column: {}", e))?;
     
                 for i in 0..batch.num_rows() {
-                    if total_lvr_cents.is_null(i) || non_zero_counts.value(i) == 0 {
+                    if total_lvr_cents.is_null(i) {
                         continue;
                     }
     
@@ -167,6 +195,35 @@ impl PrecomputedWriter {
         Ok(())
     }
     
+    // Helper function to open a reader builder that skips decoding unused columns
+    fn projected_builder(bytes: Bytes, columns: &[&str]) -> Result<ParquetRecordBatchReaderBuilder<Bytes>, anyhow::Error> {
+        let builder = ParquetRecordBatchReaderBuilder::try_new(bytes)?;
+        let indices = columns.iter()
+            .map(|name| builder.schema().index_of(name))
+            .collect::<Result<Vec<_>, _>>()?;
+        let mask = ProjectionMask::roots(builder.parquet_schema(), indices);
+        
+        Ok(builder
+            .with_projection(mask)
+            .with_batch_size(1024))
+    }
+    
+    // Helper function to open a projected reader that also drops intervals with no
+    // non-zero blocks inside the decoder, so their rows are never materialized
+    fn active_interval_reader(bytes: Bytes, columns: &[&str]) -> Result<ParquetRecordBatchReader, anyhow::Error> {
+        let builder = Self::projected_builder(bytes, columns)?;
+    
+        let non_zero_index = builder.schema().index_of("non_zero_count")?;
+        let filter_mask = ProjectionMask::roots(builder.parquet_schema(), [non_zero_index]);
+        let predicate = ArrowPredicateFn::new(filter_mask, |batch: RecordBatch| {
+            gt(batch.column(0), &UInt64Array::new_scalar(0))
+        });
+        
+        Ok(builder
+            .with_row_filter(RowFilter::new(vec![Box::new(predicate)]))
+            .build()?)
+    }
+    
     // Helper function to extract start and end blocks from file path
     fn extract_block_range_from_path(file_path: &str) -> Result<(u64, u64), anyhow::Error> {
         let file_name = file_path
@@ -190,7 +247,7 @@ impl PrecomputedWriter {
     
     async fn write_individual_running_totals(
         &self,
-        interval_data: HashMap<(u64, String, String), u64>
+        interval_data: BTreeMap<(u64, String, String), u64>
     ) -> Result<(), anyhow::Error> {
         // Create output schema for individual running totals
         let schema = arrow::datatypes::Schema::new(vec![
@@ -203,17 +260,13 @@ impl PrecomputedWriter {
         // Track running totals per pool/markout combination
         let mut running_totals: HashMap<(String, String), u64> = HashMap::new();
     
-        // Sort data points by block number
-        let mut data_points: Vec<_> = interval_data.into_iter().collect();
-        data_points.sort_by_key(|((block, _, _), _)| *block);
-    
         let mut block_numbers = Vec::new();
         let mut markout_times = Vec::new();
         let mut pool_addresses = Vec::new();
         let mut totals = Vec::new();
     
-        // Process sorted data points to maintain monotonicity
-        for ((block_number, markout_time, pool_address), interval_total) in data_points {
+        // Data points arrive in block order, which keeps the totals monotonic
+        for ((block_number, markout_time, pool_address), interval_total) in interval_data {
             let current_total = running_totals
                 .entry((pool_address.clone(), markout_time.clone()))
                 .and_modify(|total| *total = total.saturating_add(interval_total))
@@ -245,7 +298,7 @@ impl PrecomputedWriter {
     
     async fn write_aggregate_running_totals(
         &self,
-        aggregate_data: HashMap<(u64, String), u64>
+        aggregate_data: BTreeMap<(u64, String), u64>
     ) -> Result<(), anyhow::Error> {
         // Create output schema for aggregate running totals
         let schema = arrow::datatypes::Schema::new(vec![
@@ -257,16 +310,12 @@ impl PrecomputedWriter {
         // Track running totals per markout time
         let mut running_totals: HashMap<String, u64> = HashMap::new();
     
-        // Sort data points by block number
-        let mut data_points: Vec<_> = aggregate_data.into_iter().collect();
-        data_points.sort_by_key(|((block, _), _)| *block);
-    
         let mut block_numbers = Vec::new();
         let mut markout_times = Vec::new();
         let mut totals = Vec::new();
     
-        // Process sorted data points to maintain monotonicity
-        for ((block_number, markout_time), interval_total) in data_points {
+        // Data points arrive in block order, which keeps the totals monotonic
+        for ((block_number, markout_time), interval_total) in aggregate_data {
             let current_total = running_totals
                 .entry(markout_time.clone())
                 .and_modify(|total| *total = total.saturating_add(interval_total))
@@ -395,11 +444,7 @@ impl PrecomputedWriter {
                             .and_then(|s| s.strip_suffix(".parquet"))
                             .context("Failed to extract markout time from file path")?;
 
-                        let pool_name = POOL_NAMES
-                            .iter()
-                            .find(|(addr, _)| addr.to_lowercase() == pair_address)
-                            .map(|(_, name)| name.to_string())
-                            .unwrap_or_else(|| pair_address.clone());
+                        let pool_name = get_pool_name(&pair_address);
 
                         pool_addresses.push(pair_address);
                         pool_names.push(pool_name);
@@ -605,11 +650,7 @@ impl PrecomputedWriter {
                         0.0
                     };
 
-                    let pool_name = POOL_NAMES
-                        .iter()
-                        .find(|(addr, _)| addr.to_lowercase() == pool_address)
-                        .map(|(_, name)| name.to_string())
-                        .unwrap_or_else(|| pool_address.clone());
+                    let pool_name = get_pool_name(&pool_address);
 
                     pool_addresses.push(pool_address);
                     pool_names.push(pool_name);
@@ -853,9 +894,7 @@ impl PrecomputedWriter {
                 // Calculate unweighted percentiles
                 let unweighted_values: Vec<u64> = values.iter().map(|(lvr, _, _)| *lvr).collect();
                 let total_lvr = unweighted_values.iter().map(|lvr| *lvr).sum::<u64>() as f64 / 100.0;
-                let p25 = Self::calculate_unweighted_percentile(&unweighted_values, 25);
-                let p50 = Self:: calculate_unweighted_percentile(&unweighted_values, 50);
-                let p75 = Self::calculate_unweighted_percentile(&unweighted_values, 75);
+                let [p25, p50, p75] = Self::calculate_unweighted_percentiles(&unweighted_values, [25, 50, 75]);
     
                 let pool_name = get_pool_name(&pool_address);
     
@@ -990,22 +1029,41 @@ impl PrecomputedWriter {
     }
 
     pub fn calculate_unweighted_percentile(values: &[u64], percentile: u64) -> f64 {
+        let [value] = Self::calculate_unweighted_percentiles(values, [percentile]);
+        value
+    }
+
+    /// Computes several percentiles (given in ascending order) from one copy of the values
+    pub fn calculate_unweighted_percentiles<const N: usize>(values: &[u64], percentiles: [u64; N]) -> [f64; N] {
+        debug_assert!(percentiles.windows(2).all(|pair| pair[0] <= pair[1]),
+            "Percentiles must be in ascending order");
+        let mut results = [0.0; N];
         if values.is_empty() {
-            return 0.0;
+            return results;
         }
     
-        let mut sorted = values.to_vec();
-        sorted.sort_unstable();
-    
-        let rank = (percentile as f64 / 100.0) * (sorted.len() - 1) as f64;
-        let i = rank.floor() as usize;
-        let fraction = rank - i as f64;
-    
-        if i + 1 >= sorted.len() {
-            sorted[i] as f64 / 100.0
-        } else {
-            (sorted[i] as f64 * (1.0 - fraction) + sorted[i + 1] as f64 * fraction) / 100.0
+        let mut buffer = values.to_vec();
+        let last = buffer.len() - 1;
+        // Everything before `start` is known to be no larger than what follows it
+        let mut start = 0;
+    
+        for (result, percentile) in results.iter_mut().zip(percentiles) {
+            let rank = (percentile as f64 / 100.0) * last as f64;
+            let i = rank.floor() as usize;
+            let fraction = rank - i as f64;
+    
+            // Partial selection puts the i-th smallest value in place with everything
+            // larger after it, so the neighbour needed for interpolation is the minimum
+            // of the tail. Later percentiles only search from here on.
+            let (_, &mut lower, upper) = buffer[start..].select_nth_unstable(i - start);
+            *result = match upper.iter().min() {
+                Some(&next) => (lower as f64 * (1.0 - fraction) + next as f64 * fraction) / 100.0,
+                None => lower as f64 / 100.0,
+            };
+            start = i;
         }
+    
+        results
     }
 
     pub async fn write_cluster_proportions(&self) -> Result<(), anyhow::Error> {
@@ -1,13 +1,276 @@
-use std::sync::Arc;
-use object_store::ObjectStore;
+use std::{
+    collections::HashMap,
+    sync::{Arc, PoisonError, RwLock},
+    time::Duration,
+};
+use arrow::{compute::concat_batches, record_batch::RecordBatch};
+use axum::http::StatusCode;
+use bytes::Bytes;
+use chrono::{DateTime, Utc};
+use object_store::{path::Path, ObjectMeta, ObjectStore};
+use parquet::arrow::arrow_reader::ParquetRecordBatchReaderBuilder;
+use tracing::{error, info, warn};
+use crate::api::{
+    cache::ResponseCache,
+    precompute::PRECOMPUTED_MANIFEST,
+};
+
+/// How often the background refresher asks the object store whether precomputed
+/// data changed
+pub const REVALIDATE_INTERVAL: Duration = Duration::from_secs(30);
+
+/// Cheap fingerprint of a stored object, compared instead of re-reading the file
+#[derive(Debug, Clone, PartialEq)]
+struct FileSignature {
+    last_modified: DateTime<Utc>,
+    size: usize,
+    e_tag: Option<String>,
+}
+
+impl From<&ObjectMeta> for FileSignature {
+    fn from(meta: &ObjectMeta) -> Self {
+        Self {
+            last_modified: meta.last_modified,
+            size: meta.size,
+            e_tag: meta.e_tag.clone(),
+        }
+    }
+}
 
 #[derive(Clone)]
+struct PrecomputedFile {
+    bytes: Bytes,
+    signature: FileSignature,
+    /// Manifest signature when the file was loaded, i.e. the precompute run it came from
+    generation: Option<FileSignature>,
+}
+
 pub struct AppState {
     pub store: Arc<dyn ObjectStore>,
+    /// Published snapshot of the precomputed files read so far. Readers only hold the
+    /// lock long enough to clone the Arc; loading a file publishes a new map instead
+    /// of mutating the one readers may be holding.
+    precomputed: RwLock<Arc<HashMap<String, PrecomputedFile>>>,
+    /// Last observed precompute manifest signature, kept current by `refresh`
+    generation: RwLock<Option<FileSignature>>,
+    /// Precomputed files decoded into one columnar batch each, keyed by path and kept
+    /// next to the buffer they were decoded from so a reload invalidates them
+    decoded: RwLock<HashMap<String, (Bytes, RecordBatch)>>,
+    /// Memoized JSON responses, reused until `refresh` finds new data
+    pub responses: ResponseCache,
 }
 
 impl AppState {
     pub fn new(store: Arc<dyn ObjectStore>) -> Self {
-        Self { store }
+        Self {
+            store,
+            precomputed: RwLock::new(Arc::new(HashMap::new())),
+            generation: RwLock::new(None),
+            decoded: RwLock::new(HashMap::new()),
+            responses: ResponseCache::new(),
+        }
+    }
+
+    /// Returns the contents of a precomputed file, reading it from the object store
+    /// on first use. The returned Bytes share the snapshot's buffer.
+    ///
+    /// Cached files are served as-is; keeping them current is left to `refresh`,
+    /// so a request never waits on a revalidation round trip.
+    pub async fn read_precomputed(&self, path: &str) -> Result<Bytes, StatusCode> {
+        if let Some(file) = self.snapshot().get(path) {
+            return Ok(file.bytes.clone());
+        }
+
+        let generation = self.generation
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .clone();
+        self.load(path, generation).await
     }
-}
\ No newline at end of file
+
+    /// Spawns the task that runs `refresh` every REVALIDATE_INTERVAL for the life of
+    /// the server
+    pub fn spawn_refresh(self: &Arc<Self>) {
+        let state = Arc::clone(self);
+        tokio::spawn(async move {
+            loop {
+                tokio::time::sleep(REVALIDATE_INTERVAL).await;
+                state.refresh().await;
+            }
+        });
+    }
+
+    /// Brings the cached precomputed files up to date and drops memoized responses
+    /// when anything was reloaded.
+    ///
+    /// When precompute publishes a manifest, cached files stay valid until the
+    /// manifest changes, so only that one object is watched. Without a manifest,
+    /// each file's own metadata is compared against its cached signature.
+    pub async fn refresh(&self) {
+        let known = self.generation
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .clone();
+        let generation = match self.store.head(&Path::from(PRECOMPUTED_MANIFEST)).await {
+            Ok(meta) => Some(FileSignature::from(&meta)),
+            Err(object_store::Error::NotFound { .. }) => None,
+            Err(e) => {
+                warn!("Failed to check precompute manifest: {}", e);
+                return;
+            }
+        };
+
+        let mut reloaded = false;
+        for (path, file) in self.snapshot().iter() {
+            let stale = if generation.is_some() {
+                file.generation != generation
+            } else {
+                match self.store.head(&Path::from(path.as_str())).await {
+                    Ok(meta) => FileSignature::from(&meta) != file.signature,
+                    Err(e) => {
+                        // Keep serving the cached copy rather than dropping it
+                        warn!("Failed to check precomputed file {}: {}", path, e);
+                        false
+                    }
+                }
+            };
+            if !stale {
+                continue;
+            }
+
+            info!("Precomputed file {} changed, reloading", path);
+            if self.load(path, generation.clone()).await.is_ok() {
+                reloaded = true;
+            }
+        }
+
+        // Re-decode reloaded files now rather than on the next request
+        let decoded_paths: Vec<String> = self.decoded
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .keys()
+            .cloned()
+            .collect();
+        for path in decoded_paths {
+            let _ = self.read_precomputed_batch(&path).await;
+        }
+
+        if generation != known {
+            *self.generation
+                .write()
+                .unwrap_or_else(PoisonError::into_inner) = generation;
+            reloaded = true;
+        }
+        if reloaded {
+            info!("Precomputed data changed, dropping memoized responses");
+            self.responses.clear();
+        }
+    }
+
+    /// Reads a precomputed file from the object store and publishes it
+    async fn load(&self, path: &str, generation: Option<FileSignature>) -> Result<Bytes, StatusCode> {
+        let result = self.store.get(&Path::from(path))
+            .await
+            .map_err(|e| {
+                error!("Failed to read precomputed file {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?;
+        let signature = FileSignature::from(&result.meta);
+        let bytes = result
+            .bytes()
+            .await
+            .map_err(|e| {
+                error!("Failed to get bytes from precomputed file {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?;
+
+        self.publish(path, PrecomputedFile {
+            bytes: bytes.clone(),
+            signature,
+            generation,
+        });
+
+        info!("Loaded precomputed file {} ({} bytes)", path, bytes.len());
+        Ok(bytes)
+    }
+
+    fn snapshot(&self) -> Arc<HashMap<String, PrecomputedFile>> {
+        self.precomputed
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .clone()
+    }
+
+    /// Returns a precomputed file decoded into a single record batch, decoding it only
+    /// once per version of the file. Column buffers are shared, so cloning is cheap.
+    pub async fn read_precomputed_batch(&self, path: &str) -> Result<RecordBatch, StatusCode> {
+        let bytes = self.read_precomputed(path).await?;
+
+        if let Some((source, batch)) = self.decoded
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .get(path)
+        {
+            // The same buffer means the same version of the file
+            if source.as_ptr() == bytes.as_ptr() && source.len() == bytes.len() {
+                return Ok(batch.clone());
+            }
+        }
+
+        let builder = ParquetRecordBatchReaderBuilder::try_new(bytes.clone())
+            .map_err(|e| {
+                error!("Failed to create Parquet reader for {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?;
+        let schema = builder.schema().clone();
+        let batches = builder
+            .with_batch_size(8192)
+            .build()
+            .map_err(|e| {
+                error!("Failed to create Parquet reader for {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?
+            .collect::<Result<Vec<_>, _>>()
+            .map_err(|e| {
+                error!("Failed to read batch from {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?;
+        let batch = concat_batches(&schema, &batches)
+            .map_err(|e| {
+                error!("Failed to combine batches from {}: {}", path, e);
+                StatusCode::INTERNAL_SERVER_ERROR
+            })?;
+
+        self.decoded
+            .write()
+            .unwrap_or_else(PoisonError::into_inner)
+            .insert(path.to_string(), (bytes, batch.clone()));
+
+        info!("Decoded precomputed file {} ({} rows)", path, batch.num_rows());
+        Ok(batch)
+    }
+
+    fn publish(&self, path: &str, file: PrecomputedFile) {
+        // Build the next snapshot off-lock, then publish it with a single pointer swap.
+        // If another load published first, merge again from its snapshot so neither
+        // insert is lost.
+        let mut base = self.precomputed
+            .read()
+            .unwrap_or_else(PoisonError::into_inner)
+            .clone();
+        loop {
+            let mut merged = (*base).clone();
+            merged.insert(path.to_string(), file.clone());
+            let merged = Arc::new(merged);
+
+            let mut published = self.precomputed
+                .write()
+                .unwrap_or_else(PoisonError::into_inner);
+            if Arc::ptr_eq(&published, &base) {
+                *published = merged;
+                break;
+            }
+            base = published.clone();
+        }
+    }
+}
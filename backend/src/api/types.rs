@@ -15,6 +15,8 @@ pub struct TimeRangeQuery {
     pub markout_time: Option<String>,
     pub aggregate: Option<bool>,
     pub pool: Option<String>,
+    /// "rows" (default) for one object per data point, "columns" for parallel arrays
+    pub format: Option<String>,
 }
 
 
@@ -27,6 +29,52 @@ pub struct RunningTotal {
     pub running_total_cents: u64,
 }
 
+/// Column-oriented running totals, returned for `format=columns`. The pool columns
+/// are omitted for aggregate series.
+#[derive(Debug, Serialize)]
+pub struct RunningTotalColumns {
+    pub block_number: Vec<u64>,
+    pub markout: Vec<String>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub pool_name: Option<Vec<String>>,
+    #[serde(skip_serializing_if = "Option::is_none")]
+    pub pool_address: Option<Vec<String>>,
+    pub running_total_cents: Vec<u64>,
+}
+
+impl From<Vec<RunningTotal>> for RunningTotalColumns {
+    fn from(rows: Vec<RunningTotal>) -> Self {
+        let mut block_number = Vec::with_capacity(rows.len());
+        let mut markout = Vec::with_capacity(rows.len());
+        let mut pool_name = Vec::with_capacity(rows.len());
+        let mut pool_address = Vec::with_capacity(rows.len());
+        let mut running_total_cents = Vec::with_capacity(rows.len());
+        let mut has_pools = !rows.is_empty();
+
+        for row in rows {
+            block_number.push(row.block_number);
+            markout.push(row.markout);
+            running_total_cents.push(row.running_total_cents);
+
+            match (row.pool_name, row.pool_address) {
+                (Some(name), Some(address)) => {
+                    pool_name.push(name);
+                    pool_address.push(address);
+                }
+                _ => has_pools = false,
+            }
+        }
+
+        Self {
+            block_number,
+            markout,
+            pool_name: has_pools.then_some(pool_name),
+            pool_address: has_pools.then_some(pool_address),
+            running_total_cents,
+        }
+    }
+}
+
 #[derive(Debug, Serialize)]
 pub struct IntervalAPIData {
     pub total: u64,
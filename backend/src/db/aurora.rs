@@ -2,10 +2,10 @@ use crate::config::AuroraConfig;
 use crate::Error;
 use anyhow::{anyhow, Context, Result};
 use async_trait::async_trait;
-use dashmap::DashMap;
 use mysql_async::{params, Pool, PoolConstraints, PoolOpts, SslOpts};
 use serde::Deserialize;
-use std::sync::Arc;
+use std::{sync::Arc, time::Duration};
+use tokio::sync::RwLock;
 use tracing::{error, info, warn};
 use crate::DatabaseConnection;
 use mysql_async::prelude::Queryable;
@@ -17,33 +17,74 @@ pub struct LVRDetails {
     pub index: u32,
 }
 
+/// Upper bound on open connections, shared by the concurrent per-markout fetches
+const MAX_POOL_CONNECTIONS: usize = 16;
+
+/// Idle connections are closed after this long so a dead socket is not reused
+const INACTIVE_CONNECTION_TTL: Duration = Duration::from_secs(30);
+
+/// TCP keepalive interval in milliseconds
+const TCP_KEEPALIVE_MS: u32 = 30_000;
+
 pub struct AuroraConnection {
-    pools: Arc<DashMap<u64, Pool>>, // Map index to its own pool
+    // One pool for every markout index; each fetch checks out its own connection. Held
+    // in an Arc so a failing fetch can tell whether the pool it used is still current.
+    pool: Arc<RwLock<Option<Arc<Pool>>>>,
     config: AuroraConfig,
     reconnect_attempts: u32,
-    reconnect_delay: std::time::Duration,
+    reconnect_delay: Duration,
+    connection_timeout: Duration,
 }
 
 impl AuroraConnection {
     pub fn new(config: AuroraConfig) -> Result<Self> {
         Ok(Self {
-            pools: Arc::new(DashMap::new()),
-            config,
+            pool: Arc::new(RwLock::new(None)),
             reconnect_attempts: 3,
-            reconnect_delay: std::time::Duration::from_secs(5),
+            reconnect_delay: Duration::from_secs(config.retry_interval),
+            connection_timeout: Duration::from_secs(config.connection_timeout),
+            config,
         })
     }
 
-    async fn get_or_create_pool(&self, index: u64) -> Result<(Pool, bool)> {
-        if let Some(pool) = self.pools.get(&index) {
+    async fn get_or_create_pool(&self) -> Result<(Arc<Pool>, bool)> {
+        // Fast path: concurrent fetches share the read lock once a pool exists
+        if let Some(pool) = self.pool.read().await.as_ref() {
             return Ok((pool.clone(), false));
         }
 
-        let pool = self.create_pool().await?;
-        self.pools.insert(index, pool.clone());
+        let mut pool_guard = self.pool.write().await;
+        if let Some(pool) = pool_guard.as_ref() {
+            return Ok((pool.clone(), false));
+        }
+        let pool = Arc::new(self.create_pool().await?);
+        *pool_guard = Some(pool.clone());
         Ok((pool, true))
     }
 
+    /// Drops `failed` as the shared pool so the next fetch builds a new one. If another
+    /// fetch already replaced it, the newer pool is left alone.
+    async fn invalidate_pool(&self, failed: &Arc<Pool>) {
+        let stale = {
+            let mut pool_guard = self.pool.write().await;
+            match pool_guard.as_ref() {
+                Some(current) if Arc::ptr_eq(current, failed) => pool_guard.take(),
+                _ => None,
+            }
+        };
+
+        if let Some(pool) = stale {
+            // Disconnecting waits for connections other fetches still hold, so it must
+            // not hold up this fetch's retry
+            let pool = Pool::clone(&pool);
+            tokio::spawn(async move {
+                if let Err(e) = pool.disconnect().await {
+                    warn!("Failed to disconnect stale pool: {}", e);
+                }
+            });
+        }
+    }
+
     async fn create_pool(&self) -> Result<Pool> {
         let host = self.config.get_host_for_environment();
         info!("Creating connection pool with configuration:");
@@ -52,8 +93,11 @@ impl AuroraConnection {
             host, self.config.port, self.config.database
         );
     
-        let pool_constraints = PoolConstraints::new(0, 12).context("Failed to create pool constraints")?;
-        let pool_opts = PoolOpts::default().with_constraints(pool_constraints);
+        let pool_constraints = PoolConstraints::new(0, MAX_POOL_CONNECTIONS)
+            .context("Failed to create pool constraints")?;
+        let pool_opts = PoolOpts::default()
+            .with_constraints(pool_constraints)
+            .with_inactive_connection_ttl(INACTIVE_CONNECTION_TTL);
     
         let opts = mysql_async::OptsBuilder::default()
             .ip_or_hostname(host)
@@ -62,19 +106,24 @@ impl AuroraConnection {
             .pass(Some(self.config.password.clone()))
             .db_name(Some(self.config.database.clone()))
             .ssl_opts(SslOpts::default().with_danger_accept_invalid_certs(true))
+            .tcp_keepalive(Some(TCP_KEEPALIVE_MS))
             .pool_opts(pool_opts);
     
         let pool = Pool::new(opts);
     
-        match pool.get_conn().await {
-            Ok(_) => {
+        match tokio::time::timeout(self.connection_timeout, pool.get_conn()).await {
+            Ok(Ok(_)) => {
                 info!("Successfully established test connection to database");
                 Ok(pool)
             }
-            Err(e) => {
+            Ok(Err(e)) => {
                 error!("Failed to establish test connection: {}", e);
                 Err(anyhow!("Failed to verify connection: {}", e))
             }
+            Err(_) => {
+                error!("Timed out establishing test connection after {:?}", self.connection_timeout);
+                Err(anyhow!("Timed out verifying connection after {:?}", self.connection_timeout))
+            }
         }
     }
 
@@ -101,11 +150,9 @@ impl AuroraConnection {
             attempts += 1;
             let current_end = std::cmp::min(current_start + batch_size, chunk_end);
 
-            let (pool, created) = self.get_or_create_pool(index).await?;
+            let (pool, created) = self.get_or_create_pool().await?;
             if created {
-                info!("Created pool for markout time index {}.", index);
-            } else {
-                info!("Reusing pool for markout time index {}.", index);
+                info!("Created shared pool while fetching markout time index {}.", index);
             }
 
             match self
@@ -157,6 +204,8 @@ impl AuroraConnection {
                         self.reconnect_delay.as_secs()
                     );
 
+                    // Rebuild the pool for the retry in case its connections went stale
+                    self.invalidate_pool(&pool).await;
                     tokio::time::sleep(self.reconnect_delay).await;
                 }
             }
@@ -247,12 +296,9 @@ impl DatabaseConnection for AuroraConnection {
         for attempt in 0..self.reconnect_attempts {
             match self.create_pool().await {
                 Ok(pool) => {
-                    // Test the connection
-                    if pool.get_conn().await.is_ok() {
-                        // Store this as a default pool with index 0
-                        self.pools.insert(0, pool);
-                        return Ok(());
-                    }
+                    // create_pool has already verified a connection
+                    *self.pool.write().await = Some(Arc::new(pool));
+                    return Ok(());
                 }
                 Err(e) => {
                     if attempt == self.reconnect_attempts - 1 {
@@ -267,17 +313,17 @@ impl DatabaseConnection for AuroraConnection {
     }
 
     async fn disconnect(&self) -> Result<()> {
-        // Clear all pools
-        self.pools.clear();
+        if let Some(pool) = self.pool.write().await.take() {
+            Pool::clone(&pool).disconnect().await.context("Failed to disconnect pool")?;
+        }
         Ok(())
     }
 
     async fn is_connected(&self) -> bool {
-        // Check if any pool is connected
-        if let Some(pool) = self.pools.get(&0) {
-            pool.get_conn().await.is_ok()
-        } else {
-            false
+        let pool = self.pool.read().await.clone();
+        match pool {
+            Some(pool) => pool.get_conn().await.is_ok(),
+            None => false,
         }
     }
 }
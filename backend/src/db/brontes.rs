@@ -3,23 +3,56 @@ use crate::DatabaseConnection;
 use crate::Error;
 use crate::BRONTES_ADDRESSES;
 use async_trait::async_trait;
-use clickhouse::Client;
-use serde::Deserialize;
+use clickhouse::{Client, Compression};
 use std::sync::Arc;
-use tokio::sync::Mutex;
+use tokio::sync::RwLock;
 use anyhow::Result;
 use tracing::{warn,info, error};
+use lazy_static::lazy_static;
 
-#[derive(Debug, Deserialize, Clone)]
+lazy_static! {
+    /// Query text with the pool list rendered once. Block bounds are server-side query
+    /// parameters, so every batch sends byte-identical SQL. Pools come back as their
+    /// 1-based position in BRONTES_ADDRESSES, so rows are fixed-width numbers. The run
+    /// and block filters are PREWHERE so only matching parts of the table are read
+    /// before the pool arrays are expanded.
+    static ref LVR_ANALYSIS_QUERY: String = {
+        let pools = BRONTES_ADDRESSES.iter()
+            .map(|address| format!("'{}'", address))
+            .collect::<Vec<_>>()
+            .join(", ");
+
+        format!(
+            r#"
+            SELECT 
+                indexOf([{pools}], p.profit) AS pool_index,
+                block_number,
+                SUM(p.profit_amt + p.revenue_amt) AS lvr
+            FROM brontes.block_analysis
+            ARRAY JOIN cex_dex_arbed_pool_all AS p
+            PREWHERE run_id = 1000
+                AND block_number > {{batch_start:UInt64}}
+                AND block_number <= {{batch_end:UInt64}}
+            WHERE p.profit in ({pools})
+                AND p.revenue != '0x0000000000000000000000000000000000000000'
+            GROUP BY block_number, pool_index
+            ORDER BY block_number ASC
+            "#,
+            pools = pools
+        )
+    };
+}
+
+#[derive(Debug, Clone)]
 pub struct LVRAnalysis {
-    pub pool_address: String,
+    pub pool_address: &'static str,
     pub block_number: u64,
     pub lvr: f64,
 }
 
 
 pub struct BrontesConnection {
-    client: Arc<Mutex<Option<Client>>>,
+    client: Arc<RwLock<Option<Client>>>,
     config: BrontesConfig,
     reconnect_attempts: u32,
     reconnect_delay: std::time::Duration,
@@ -28,7 +61,7 @@ pub struct BrontesConnection {
 impl BrontesConnection {
     pub fn new(config: BrontesConfig) -> Result<Self> {
         Ok(Self {
-            client: Arc::new(Mutex::new(None)),
+            client: Arc::new(RwLock::new(None)),
             config,
             reconnect_attempts: 3,
             reconnect_delay: std::time::Duration::from_secs(5),
@@ -41,10 +74,12 @@ impl BrontesConnection {
             self.config.port
         );
     
+        // Result sets span thousands of blocks per batch; LZ4 keeps the transfer small
         Ok(Client::default()
             .with_url(url)
             .with_user(self.config.user.clone())
-            .with_password(self.config.password.clone()))
+            .with_password(self.config.password.clone())
+            .with_compression(Compression::Lz4))
     }
 
     pub async fn fetch_lvr_analysis(&self, chunk_start: u64, chunk_end: u64) -> Result<Vec<LVRAnalysis>> {
@@ -66,10 +101,10 @@ impl BrontesConnection {
             let current_end = std::cmp::min(current_start + batch_size, chunk_end);
             let client = self.get_or_create_client().await?;
 
-            match self.try_fetch_lvr_analysis_batch(&client, current_start, current_end).await {
-                Ok(batch_results) => {
-                    let batch_count = batch_results.len();
-                    all_results.extend(batch_results);
+            let batch_offset = all_results.len();
+
+            match self.try_fetch_lvr_analysis_batch(&client, current_start, current_end, &mut all_results).await {
+                Ok(batch_count) => {
                     current_start = current_end;
                     attempts = 0;
                     completed_batches += 1;
@@ -84,6 +119,9 @@ impl BrontesConnection {
                     );
                 },
                 Err(e) => {
+                    // Drop any rows streamed in before the batch failed
+                    all_results.truncate(batch_offset);
+
                     if attempts >= self.reconnect_attempts {
                         error!(
                             "Failed to fetch LVR analysis after {} attempts (batch {}/{}, blocks {}-{}): {}", 
@@ -110,6 +148,8 @@ impl BrontesConnection {
                         self.reconnect_delay.as_secs()
                     );
 
+                    // Rebuild the client for the retry in case its connections went stale
+                    self.invalidate_client().await;
                     tokio::time::sleep(self.reconnect_delay).await;
                 }
             }
@@ -124,64 +164,67 @@ impl BrontesConnection {
         Ok(all_results)
     }
 
-    async fn try_fetch_lvr_analysis_batch(&self, client: &Client, batch_start: u64, batch_end: u64) -> Result<Vec<LVRAnalysis>> {    
-        // De-checksum the addresses
-        let pools: Vec<_> = BRONTES_ADDRESSES.iter().map(|&s| s).collect();
+    /// Streams the rows for one batch straight into `results` and returns how many were added
+    async fn try_fetch_lvr_analysis_batch(
+        &self,
+        client: &Client,
+        batch_start: u64,
+        batch_end: u64,
+        results: &mut Vec<LVRAnalysis>
+    ) -> Result<usize> {    
         let mut cursor = client
-            .query(
-                r#"
-                SELECT 
-                    p.profit AS pool_address,
-                    block_number,
-                    SUM(p.profit_amt + p.revenue_amt) AS lvr
-                FROM brontes.block_analysis
-                ARRAY JOIN cex_dex_arbed_pool_all AS p
-                WHERE p.profit in (?)
-                    AND run_id = 1000
-                    AND p.profit != '0x0000000000000000000000000000000000000000'
-                    AND p.revenue != '0x0000000000000000000000000000000000000000'
-                    AND block_number > ?
-                    AND block_number <= ?
-                GROUP BY block_number, pool_address
-                ORDER BY block_number ASC
-                "#
-            )
-            .bind(pools)
-            .bind(batch_start)
-            .bind(batch_end)
-            .fetch::<(String, u64, f64)>()?;
+            .clone()
+            .with_option("param_batch_start", batch_start.to_string())
+            .with_option("param_batch_end", batch_end.to_string())
+            .query(&LVR_ANALYSIS_QUERY)
+            .fetch::<(u64, u64, f64)>()?;
 
         info!(
             "Executing query for block range {}-{}", 
             batch_start, batch_end
         );
 
-        let mut results = Vec::new();
-        while let Some((pool_address, block_number, lvr)) = cursor.next().await? {
+        let batch_offset = results.len();
+        while let Some((pool_index, block_number, lvr)) = cursor.next().await? {
+            // The IN filter guarantees a match, so index 0 (not found) never appears
+            let Some(pool_address) = BRONTES_ADDRESSES.get(pool_index.wrapping_sub(1) as usize).map(String::as_str) else {
+                warn!("Skipping row with unknown pool index {} at block {}", pool_index, block_number);
+                continue;
+            };
             results.push(LVRAnalysis {
                 pool_address,
                 block_number,
                 lvr,
             });
         }
+        let batch_count = results.len() - batch_offset;
 
         info!(
             "Retrieved {} records for block range {}-{}",
-            results.len(),
+            batch_count,
             batch_start,
             batch_end
         );
     
-        Ok(results)
+        Ok(batch_count)
     }
 
     async fn get_or_create_client(&self) -> Result<Client> {
-        let mut client_guard = self.client.lock().await;
+        // Fast path: concurrent fetches share the read lock once a client exists
+        if let Some(client) = self.client.read().await.as_ref() {
+            return Ok(client.clone());
+        }
+
+        let mut client_guard = self.client.write().await;
         if client_guard.is_none() {
             *client_guard = Some(self.create_client().await?);
         }
         Ok(client_guard.as_ref().unwrap().clone())
     }
+
+    async fn invalidate_client(&self) {
+        *self.client.write().await = None;
+    }
 }
 
 #[async_trait]
@@ -192,7 +235,7 @@ impl DatabaseConnection for BrontesConnection {
         while current_attempt < self.reconnect_attempts {
             match self.create_client().await {
                 Ok(client) => {
-                    let mut client_guard = self.client.lock().await;
+                    let mut client_guard = self.client.write().await;
                     *client_guard = Some(client);
                     return Ok(());
                 }
@@ -210,13 +253,13 @@ impl DatabaseConnection for BrontesConnection {
     }
     
     async fn disconnect(&self) -> Result<()> {
-        let mut client_guard = self.client.lock().await;
+        let mut client_guard = self.client.write().await;
         *client_guard = None;
         Ok(())
     }
     
     async fn is_connected(&self) -> bool {
-        let client_guard = self.client.lock().await;
+        let client_guard = self.client.read().await;
         if let Some(client) = &*client_guard {
             match client.query("SELECT 1 as value")
                 .fetch::<u8>()
@@ -110,15 +110,15 @@ async fn run_validation(store: Arc<dyn ObjectStore>) -> Result<()> {
 
 #[tokio::main]
 async fn main() -> Result<()> {
+    // Load environment variables first so LOG_LEVEL can come from .env
+    dotenv::dotenv().ok();
+
     // Initialize logging
     init_logging();
 
     // Parse command line arguments
     let cli = Cli::parse();
 
-    // Load environment variables
-    dotenv::dotenv().ok();
-
     // Ensure data directories exist
     let data_dir = ensure_directories()?;
 
@@ -211,6 +211,8 @@ async fn main() -> Result<()> {
             
             info!("Computing distribution metrics...");
             writer.write_distribution_metrics().await?;
+            
+            writer.write_manifest().await?;
     
             info!("Successfully completed all precomputation tasks");
         }
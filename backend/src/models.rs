@@ -72,6 +72,28 @@ impl ClusterBlockActivity {
         }
     }
     
+    /// Marks every block in `[start_block, end_block)` as processed with zero LVR.
+    /// Equivalent to calling `process_block(block, false)` for each block in order,
+    /// but sets whole runs of bits at once instead of one block at a time.
+    pub fn process_range(&mut self, start_block: u64, end_block: u64) {
+        // Blocks before the current base are ignored, as in process_block
+        let mut block_number = start_block.max(self.base_block);
+        
+        while block_number < end_block {
+            let mut idx = (block_number - self.base_block) as usize;
+            
+            // Same flush point as process_block: the first block past the window
+            if idx >= self.processed_blocks.len() {
+                self.flush_and_reset(block_number);
+                idx = 0;
+            }
+            
+            let run = ((end_block - block_number) as usize).min(self.processed_blocks.len() - idx);
+            self.processed_blocks[idx..idx + run].fill(true);
+            block_number += run as u64;
+        }
+    }
+    
     fn flush_and_reset(&mut self, new_base_block: u64) {
         // Accumulate counts before clearing
         self.accumulated_total += self.processed_blocks.count_ones() as u64;
@@ -301,10 +323,9 @@ impl Checkpoint {
             0.0
         };
 
-        // Calculate percentiles using TDigest
-        let p25 = digest.quantile(0.25).map(|x| (x * 100.0).round() as u64).unwrap_or(0);
-        let p50 = digest.quantile(0.50).map(|x| (x * 100.0).round() as u64).unwrap_or(0);
-        let p75 = digest.quantile(0.75).map(|x| (x * 100.0).round() as u64).unwrap_or(0);
+        // Calculate percentiles using TDigest, from one sorted pass over its centroids
+        let [p25, p50, p75] = digest.quantiles([0.25, 0.50, 0.75])
+            .map(|quantile| quantile.map(|x| (x * 100.0).round() as u64).unwrap_or(0));
 
         // Get distribution metrics from TDigest
         let distribution_metrics = digest.online_stats.to_metrics();
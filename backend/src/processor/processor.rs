@@ -9,12 +9,11 @@ use crate::{
 use anyhow::Result;
 use dashmap::DashMap;
 use ordered_float::OrderedFloat;
-use std::{collections::{HashSet,HashMap}, sync::Arc};
+use std::{collections::HashMap, sync::Arc};
 use tracing::{info, error, warn, debug};
 use object_store::ObjectStore;
 use std::sync::atomic::Ordering;
 use futures::stream::{FuturesOrdered, StreamExt};
-use futures::lock::Mutex;
 use tokio::sync::Barrier;
 use anyhow::Context;
 
@@ -29,6 +28,164 @@ struct ProcessedData {
     intervals: Vec<IntervalData>
 }
 
+/// Returns (block_number, lvr_cents) for the data points in `[start, end)`, sorted
+/// by block. If a block appears more than once, the last value reported wins.
+fn sorted_points(data: &[UnifiedLVRData], start: u64, end: u64) -> Vec<(u64, u64)> {
+    let mut points: Vec<(u64, u64)> = data.iter()
+        .filter(|d| d.block_number >= start && d.block_number < end)
+        .map(|d| (d.block_number, d.lvr_cents))
+        .collect();
+    points.sort_by_key(|&(block_number, _)| block_number);
+    points.dedup_by(|later, earlier| {
+        if later.0 == earlier.0 {
+            earlier.1 = later.1;
+            true
+        } else {
+            false
+        }
+    });
+    points
+}
+
+/// Calls `on_value` with the pool index and dollar value of each pool found in a
+/// details payload, in payload order. A pool's first entry with a `dollarValue`
+/// decides it, even if that value is not a number; entries that hold neither a
+/// `dollarValue` nor a plain number are skipped, as are unknown pool names.
+pub fn parse_lvr_details(
+    details_str: &str,
+    pool_indices: &HashMap<&str, usize>,
+    mut on_value: impl FnMut(usize, f64),
+) {
+    // Attempt to parse as a vector of vectors of strings
+    let Ok(details) = serde_json::from_str::<Vec<Vec<String>>>(details_str) else {
+        // Log the parsing error for debugging
+        error!("Failed to parse details_str as Vec<Vec<String>>");
+        return;
+    };
+
+    let mut resolved = vec![false; pool_indices.len()];
+    for entry in details {
+        if entry.len() != 2 {
+            continue;
+        }
+        let Some(&idx) = pool_indices.get(entry[0].as_str()) else {
+            continue;
+        };
+        if resolved[idx] {
+            continue;
+        }
+        let value_str = &entry[1];
+
+        // Parse value_str as JSON to extract 'dollarValue'
+        if let Ok(detail) = serde_json::from_str::<HashMap<String, serde_json::Value>>(value_str) {
+            if let Some(dollar_value) = detail.get("dollarValue") {
+                resolved[idx] = true;
+                if let Some(value) = dollar_value.as_f64() {
+                    on_value(idx, value);
+                }
+                continue;
+            }
+        }
+        // Fall back to parsing value_str as a float
+        if let Ok(value) = value_str.parse::<f64>() {
+            resolved[idx] = true;
+            on_value(idx, value);
+        }
+    }
+}
+
+/// One Brontes entry per block in `[chunk_start, chunk_end)`: the pool's event where it
+/// has one, zero LVR otherwise. Events must lie inside the range; if a block has more
+/// than one, the first reported wins.
+pub fn zero_filled_blocks(
+    chunk_start: u64,
+    chunk_end: u64,
+    events: Vec<UnifiedLVRData>,
+) -> Vec<UnifiedLVRData> {
+    // Start from a dense run of zeros, one per block, and scatter the events into it
+    // by offset
+    let mut complete_data: Vec<UnifiedLVRData> = (chunk_start..chunk_end)
+        .map(|block| UnifiedLVRData {
+            block_number: block,
+            lvr_cents: 0,
+            source: DataSource::Brontes,
+        })
+        .collect();
+
+    // Reversed so the first event for a block wins
+    for event in events.into_iter().rev() {
+        let offset = (event.block_number - chunk_start) as usize;
+        complete_data[offset] = event;
+    }
+    complete_data
+}
+
+/// Daily interval metrics for one pool and markout over `[chunk_start, chunk_end)`.
+/// Blocks before `deployment_block` are left out, and every interval overlapping the
+/// rest of the range is emitted, in order.
+pub fn interval_metrics(
+    chunk_start: u64,
+    chunk_end: u64,
+    deployment_block: u64,
+    pool_address: &str,
+    markout_time: MarkoutTime,
+    data: &[UnifiedLVRData],
+) -> Vec<IntervalData> {
+    let blocks_per_interval = BLOCKS_PER_DAY;
+
+    // Adjust chunk boundaries based on deployment block
+    let effective_chunk_start = chunk_start.max(deployment_block);
+    
+    // Early return if chunk is entirely before deployment or empty
+    if effective_chunk_start >= chunk_end {
+        return Vec::new();
+    }
+
+    // Collect the data points within the effective range in block order
+    let points = sorted_points(data, effective_chunk_start, chunk_end);
+
+    // Every interval overlapping the effective range is emitted, even if it has no
+    // data points; blocks without a data point count as zero
+    let first_interval = (effective_chunk_start - chunk_start) / blocks_per_interval;
+    let last_interval = (chunk_end - 1 - chunk_start) / blocks_per_interval;
+    let mut result = Vec::with_capacity((last_interval - first_interval + 1) as usize);
+    let mut points = points.into_iter().peekable();
+
+    // Walk the sorted points once, closing an interval whenever we pass its end
+    for interval_id in first_interval..=last_interval {
+        // Calculate interval boundaries
+        let interval_start = chunk_start + (interval_id * blocks_per_interval);
+        let interval_end = (interval_start + blocks_per_interval).min(chunk_end);
+        
+        // Only count blocks after deployment
+        let effective_interval_start = interval_start.max(effective_chunk_start);
+        let total_count = interval_end - effective_interval_start;
+
+        let mut total_lvr_cents = 0u64;
+        let mut max_lvr_cents = 0u64;
+        let mut non_zero_count = 0u64;
+        while let Some((_, value)) = points.next_if(|&(block_number, _)| block_number < interval_end) {
+            if value > 0 {
+                total_lvr_cents += value;
+                max_lvr_cents = max_lvr_cents.max(value);
+                non_zero_count += 1;
+            }
+        }
+
+        result.push(IntervalData {
+            interval_id,
+            pair_address: pool_address.to_string(),
+            markout_time: markout_time.clone(),
+            total_lvr_cents,
+            max_lvr_cents,
+            non_zero_count,
+            total_count,
+        });
+    }
+
+    result
+}
+
 pub struct ParallelLVRProcessor {
     start_block: u64,
     end_block: u64,
@@ -36,7 +193,8 @@ pub struct ParallelLVRProcessor {
     cluster_activity: Arc<DashMap<(String, MarkoutTime), ClusterBlockActivity>>,
     aurora_connection: Arc<AuroraConnection>,
     brontes_connection: Arc<BrontesConnection>,
-    parquet_writer: Arc<Mutex<ParallelParquetWriter>>,
+    // Shared without a lock; the writer bounds its own concurrency with a semaphore
+    parquet_writer: Arc<ParallelParquetWriter>,
     update_barrier: Arc<Barrier>,
     object_store: Arc<dyn ObjectStore>,
     max_chunk_size: usize, // For ClusterBlockActivity bit vectors
@@ -53,7 +211,7 @@ impl ParallelLVRProcessor {
         
         let aurora_connection = Arc::new(AuroraConnection::new(aurora_config)?);
         let brontes_connection = Arc::new(BrontesConnection::new(brontes_config)?);
-        let parquet_writer = Arc::new(Mutex::new(ParallelParquetWriter::new(object_store.clone())));
+        let parquet_writer = Arc::new(ParallelParquetWriter::new(object_store.clone()));
 
         Ok(Self {
             start_block,
@@ -208,8 +366,7 @@ impl ParallelLVRProcessor {
         // Write interval data if needed
         if chunk_end - chunk_start >= BLOCKS_PER_CHUNK || chunk_end == self.end_block {
             if !processed_data.intervals.is_empty() {
-                let mut writer = self.parquet_writer.lock().await;
-                writer
+                self.parquet_writer
                     .write_interval_data(processed_data.intervals, chunk_start, chunk_end)
                     .await?;
             }
@@ -238,17 +395,19 @@ impl ParallelLVRProcessor {
             aurora_tasks.push_back(task);
         }
 
-        // Fetch Brontes data concurrently
-        let brontes_task = self.brontes_connection.fetch_lvr_analysis(chunk_start, chunk_end);
+        // Collect Aurora results in markout order
+        let aurora_task = async {
+            let mut aurora_results = Vec::new();
+            while let Some(result) = aurora_tasks.next().await {
+                aurora_results.push(result?);
+            }
+            Ok::<_, anyhow::Error>(aurora_results)
+        };
 
-        // Wait for all Aurora results
-        let mut aurora_results = Vec::new();
-        while let Some(result) = aurora_tasks.next().await {
-            aurora_results.push(result?);
-        }
+        let brontes_task = self.brontes_connection.fetch_lvr_analysis(chunk_start, chunk_end);
 
-        // Wait for Brontes results
-        let brontes_results = brontes_task.await?;
+        // Drive both sources at once so the Brontes fetch overlaps the Aurora ones
+        let (aurora_results, brontes_results) = tokio::try_join!(aurora_task, brontes_task)?;
 
         Ok((aurora_results, brontes_results))
     }
@@ -260,47 +419,56 @@ impl ParallelLVRProcessor {
         aurora_results: Vec<Vec<LVRDetails>>,
         brontes_results: Vec<LVRAnalysis>
     ) -> Result<(ProcessedData, Vec<CheckpointUpdate>)> {
-        let unified_data = DashMap::new();
+        // Each (pool, markout) series is produced exactly once, so a plain list is enough
+        let mut unified_data: Vec<((String, MarkoutTime), Vec<UnifiedLVRData>)> = Vec::new();
         let mut checkpoint_updates = Vec::new();
         let mut successful_intervals = Vec::new();
     
-        // Process Aurora data
+        // Pool names used in the Aurora details payload, mapped to their position in POOL_ADDRESSES
+        let pool_indices = POOL_ADDRESSES.iter()
+            .enumerate()
+            .map(|(idx, pool_address)| {
+                POOL_NAMES.get(*pool_address)
+                    .map(|&pool_name| (pool_name, idx))
+                    .context("Unknown pool address")
+            })
+            .collect::<Result<HashMap<&str, usize>>>()?;
+    
+        // Process Aurora data, parsing each row's details once and routing every entry
+        // to its pool rather than re-parsing the row for each pool
         for (markout_idx, aurora_markout_data) in aurora_results.into_iter().enumerate() {
             let markout_time = MarkoutTime::from_f64(MARKOUT_TIMES[markout_idx])
                 .context("Invalid markout time")?;
     
-            for pool_address in POOL_ADDRESSES.iter() {
-                let pool_name = POOL_NAMES.get(*pool_address)
-                    .context("Unknown pool address")?;
-    
-                let aurora_data: Vec<UnifiedLVRData> = aurora_markout_data.iter()
-                    .filter_map(|detail| {
-                        self.parse_lvr_details(&detail.details, pool_name)
-                            .and_then(|lvr| {
-                                self.to_cents(lvr).ok().map(|cents| UnifiedLVRData {
-                                    block_number: detail.block_number,
-                                    lvr_cents: cents,
-                                    source: DataSource::Aurora,
-                                })
-                            })
-                    })
-                    .collect();
+            let mut pool_data: Vec<Vec<UnifiedLVRData>> = vec![Vec::new(); POOL_ADDRESSES.len()];
+            for detail in &aurora_markout_data {
+                parse_lvr_details(&detail.details, &pool_indices, |idx, lvr| {
+                    if let Ok(cents) = self.to_cents(lvr) {
+                        pool_data[idx].push(UnifiedLVRData {
+                            block_number: detail.block_number,
+                            lvr_cents: cents,
+                            source: DataSource::Aurora,
+                        });
+                    }
+                });
+            }
     
+            for (pool_address, aurora_data) in POOL_ADDRESSES.iter().zip(pool_data) {
                 if !aurora_data.is_empty() {
-                    unified_data.insert((pool_address.to_string(), markout_time), aurora_data);
+                    unified_data.push(((pool_address.to_string(), markout_time), aurora_data));
                 }
             }
         }
     
-        // Process Brontes data
-        let mut brontes_data: HashMap<String, Vec<UnifiedLVRData>> = HashMap::new();
+        // Process Brontes data, keyed by the static address entry (already lowercase)
+        let mut brontes_data: HashMap<&'static str, Vec<UnifiedLVRData>> = HashMap::new();
     
         // First, collect all actual Brontes events
         for result in brontes_results {
             if result.block_number >= chunk_start && result.block_number < chunk_end {
                 if let Ok(cents) = self.to_cents(result.lvr) {
                     brontes_data
-                        .entry(result.pool_address.to_lowercase())
+                        .entry(result.pool_address)
                         .or_default()
                         .push(UnifiedLVRData {
                             block_number: result.block_number,
@@ -313,60 +481,21 @@ impl ParallelLVRProcessor {
     
         // Process each Brontes pool
         for pool_address in BRONTES_ADDRESSES.iter() {
-            // Get or create vector for this pool
-            let mut pool_data = brontes_data
-                .remove(*pool_address)
+            let pool_data = brontes_data
+                .remove(pool_address.as_str())
                 .unwrap_or_default();
-            
-            // Sort by block number for efficient lookup
-            pool_data.sort_by_key(|data| data.block_number);
-            let event_blocks: HashSet<u64> = pool_data
-                .iter()
-                .map(|data| data.block_number)
-                .collect();
-    
-            // Add zeros for blocks without events
-            let mut complete_data = Vec::with_capacity((chunk_end - chunk_start) as usize);
-            
-            // Add existing events and zeros in sorted order
-            for block in chunk_start..chunk_end {
-                if event_blocks.contains(&block) {
-                    let event = pool_data
-                        .iter()
-                        .find(|data| data.block_number == block)
-                        .unwrap()
-                        .clone();
-                    complete_data.push(event);
-                } else {
-                    complete_data.push(UnifiedLVRData {
-                        block_number: block,
-                        lvr_cents: 0,
-                        source: DataSource::Brontes,
-                    });
-                }
-            }
+    
+            let complete_data = zero_filled_blocks(chunk_start, chunk_end, pool_data);
     
             // Insert into unified data (we'll always have at least zeros)
-            unified_data.insert(
+            unified_data.push((
                 (pool_address.to_string(), MarkoutTime::Brontes),
                 complete_data
-            );
+            ));
         }
     
         // Process all data
-        for entry in unified_data.iter() {
-            let (key, data) = entry.pair();
-            let (pool_address, markout_time) = key;
-            
-            // Add checkpoint update
-            checkpoint_updates.push(CheckpointUpdate {
-                pool_address: pool_address.clone(),
-                markout_time: markout_time.clone(),
-                data: data.clone(),
-                chunk_start,
-                chunk_end,
-            });
-    
+        for ((pool_address, markout_time), data) in unified_data {
             // Calculate intervals
             match self.calculate_interval_metrics(
                 chunk_start,
@@ -381,6 +510,15 @@ impl ParallelLVRProcessor {
                     pool_address, markout_time, e
                 )),
             }
+    
+            // Add checkpoint update, handing over the series rather than copying it
+            checkpoint_updates.push(CheckpointUpdate {
+                pool_address,
+                markout_time,
+                data,
+                chunk_start,
+                chunk_end,
+            });
         }
     
         Ok((
@@ -435,8 +573,7 @@ impl ParallelLVRProcessor {
             checkpoints.len()
         );
     
-        let mut writer = self.parquet_writer.lock().await;
-        writer.write_checkpoints(checkpoints).await?;
+        self.parquet_writer.write_checkpoints(checkpoints).await?;
     
         // Log the successful completion of checkpoint writing
         info!("Successfully wrote checkpoints.");
@@ -480,78 +617,69 @@ impl ParallelLVRProcessor {
             .entry((pool_address.to_string(), markout_time.clone()))
             .or_insert_with(|| Checkpoint::new(pool_address.to_string(), markout_time.clone()));
     
-        // Create a map of block numbers to data points for efficient lookup
-        let block_data: HashMap<u64, &UnifiedLVRData> = data.iter()
-            .filter(|d| d.block_number >= effective_start && d.block_number < chunk_end)
-            .map(|d| (d.block_number, d))
-            .collect();
+        // Only blocks with a data point need visiting; every other block is a zero
+        let points = sorted_points(data, effective_start, chunk_end);
     
-        let mut updates = 0;
+        let updates = chunk_end - effective_start;
         let mut max_lvr = 0u64;
         let mut max_lvr_block = 0u64;
         let mut running_total = 0i64;
         let mut bucket_counts = [0u64; 7];  // Array for all bucket counts
         let mut non_zero_values = Vec::new();
     
-        // Process each block in the range
-        for block_number in effective_start..chunk_end {
-            updates += 1;
-            let mut has_nonzero_lvr = false;
-    
-            if let Some(data_point) = block_data.get(&block_number) {
-                let lvr_cents = data_point.lvr_cents;
-                
-                // Update running statistics
-                running_total += lvr_cents as i64;
-                
-                // Update max LVR if needed
-                if lvr_cents > max_lvr {
-                    max_lvr = lvr_cents;
-                    max_lvr_block = block_number;
-                }
+        // Blocks without a data point all land in the zero bucket
+        bucket_counts[0] = updates - points.len() as u64;
     
-                // Collect non-zero values for TDigest and track for cluster activity
-                if lvr_cents > 0 {
-                    non_zero_values.push(lvr_cents as f64 / 100.0);  // Convert to dollars for TDigest
-                    has_nonzero_lvr = true;
-                }
+        for &(block_number, lvr_cents) in &points {
+            // Update running statistics
+            running_total += lvr_cents as i64;
+            
+            // Update max LVR if needed
+            if lvr_cents > max_lvr {
+                max_lvr = lvr_cents;
+                max_lvr_block = block_number;
+            }
     
-                // Update bucket counts
-                let dollars = lvr_cents as f64 / 100.0;
-                let bucket_idx = match dollars {
-                    x if x == 0.0 => 0,
-                    x if x <= 10.0 => 1,
-                    x if x <= 100.0 => 2,
-                    x if x <= 500.0 => 3,
-                    x if x <= 1000.0 => 4,
-                    x if x <= 10000.0 => 5,
-                    _ => 6,
-                };
-                bucket_counts[bucket_idx] += 1;
-            } else {
-                // Count zero values
-                bucket_counts[0] += 1;
+            // Collect non-zero values for TDigest
+            if lvr_cents > 0 {
+                non_zero_values.push(lvr_cents as f64 / 100.0);  // Convert to dollars for TDigest
             }
     
-            // Update cluster activity tracking if this pool belongs to a cluster
-            if let Some(ref cluster) = cluster_name {
-                let key = (cluster.clone(), markout_time.clone());
-                // Using the cluster_activity DashMap with get_mut
-                if let Some(mut activity) = self.cluster_activity.get_mut(&key) {
-                    // Use the bit vector-based method to process this block
-                    activity.process_block(block_number, has_nonzero_lvr);
-                } else {
-                    // First time seeing this cluster+markout combination, initialize it
-                    let mut activity = ClusterBlockActivity::new(
-                        cluster.clone(), 
-                        markout_time.clone(), 
-                        chunk_start,
-                        self.max_chunk_size
-                    );
-                    activity.process_block(block_number, has_nonzero_lvr);
-                    self.cluster_activity.insert(key, activity);
+            // Update bucket counts
+            let dollars = lvr_cents as f64 / 100.0;
+            let bucket_idx = match dollars {
+                x if x == 0.0 => 0,
+                x if x <= 10.0 => 1,
+                x if x <= 100.0 => 2,
+                x if x <= 500.0 => 3,
+                x if x <= 1000.0 => 4,
+                x if x <= 10000.0 => 5,
+                _ => 6,
+            };
+            bucket_counts[bucket_idx] += 1;
+        }
+    
+        // Update cluster activity tracking if this pool belongs to a cluster. Runs of
+        // zero blocks between non-zero blocks are marked in one go.
+        if let Some(cluster) = cluster_name {
+            let mut activity = self.cluster_activity
+                .entry((cluster.clone(), markout_time.clone()))
+                .or_insert_with(|| ClusterBlockActivity::new(
+                    cluster,
+                    markout_time.clone(),
+                    chunk_start,
+                    self.max_chunk_size
+                ));
+    
+            let mut next_block = effective_start;
+            for &(block_number, lvr_cents) in &points {
+                if lvr_cents > 0 {
+                    activity.process_range(next_block, block_number);
+                    activity.process_block(block_number, true);
+                    next_block = block_number + 1;
                 }
             }
+            activity.process_range(next_block, chunk_end);
         }
     
         if updates > 0 {
@@ -598,83 +726,8 @@ impl ParallelLVRProcessor {
         markout_time: MarkoutTime,
         data: &[UnifiedLVRData],
     ) -> Result<Vec<IntervalData>> {
-        let blocks_per_interval = BLOCKS_PER_DAY;
         let deployment_block = self.get_deployment_block(pool_address);
-    
-        // Adjust chunk boundaries based on deployment block
-        let effective_chunk_start = chunk_start.max(deployment_block);
-        
-        // Early return if chunk is entirely before deployment or empty
-        if effective_chunk_start >= chunk_end {
-            return Ok(Vec::new());
-        }
-    
-        // Create map to store data for each block
-        let block_data: DashMap<u64, u64> = DashMap::new();
-        
-        // Map all available data points within effective range
-        data.iter()
-            .filter(|d| d.block_number >= effective_chunk_start && d.block_number < chunk_end)
-            .for_each(|data_point| {
-                block_data.insert(data_point.block_number, data_point.lvr_cents);
-            });
-    
-        // Create interval groups with explicit zero handling
-        let interval_groups: DashMap<u64, Vec<(u64, u64)>> = DashMap::new();
-        
-        // Process each block in range, mapping to intervals and tracking block numbers
-        for block_number in effective_chunk_start..chunk_end {
-            let interval_id = (block_number - chunk_start) / blocks_per_interval;
-            let value = block_data.get(&block_number).map(|v| *v).unwrap_or(0);
-            
-            interval_groups
-                .entry(interval_id)
-                .and_modify(|v| v.push((block_number, value)))
-                .or_insert_with(|| vec![(block_number, value)]);
-        }
-    
-        // Calculate metrics for each interval
-        let result: Vec<_> = interval_groups
-            .into_iter()
-            .map(|(interval_id, blocks)| {
-                // Calculate interval boundaries
-                let interval_start = chunk_start + (interval_id * blocks_per_interval);
-                let interval_end = (interval_start + blocks_per_interval).min(chunk_end);
-                
-                // Calculate effective range for this interval
-                let effective_interval_start = interval_start.max(deployment_block);
-                
-                // Count total blocks in effective range
-                let total_count = if effective_interval_start >= interval_end {
-                    0
-                } else {
-                    // Only count blocks after deployment
-                    blocks.iter()
-                        .filter(|(block_number, _)| *block_number >= effective_interval_start)
-                        .count() as u64
-                };
-    
-                // Count non-zero values in effective range
-                let non_zero_values: Vec<_> = blocks.iter()
-                    .filter(|(block_number, value)| {
-                        *block_number >= effective_interval_start && *value > 0
-                    })
-                    .map(|(_, value)| *value)
-                    .collect();
-    
-                IntervalData {
-                    interval_id,
-                    pair_address: pool_address.to_string(),
-                    markout_time: markout_time.clone(),
-                    total_lvr_cents: non_zero_values.iter().sum(),
-                    max_lvr_cents: non_zero_values.iter().copied().max().unwrap_or(0),
-                    non_zero_count: non_zero_values.len() as u64,
-                    total_count,
-                }
-            })
-            .collect();
-    
-        Ok(result)
+        Ok(interval_metrics(chunk_start, chunk_end, deployment_block, pool_address, markout_time, data))
     }
 
     async fn persist_cluster_activity(&self) -> Result<()> {
@@ -685,8 +738,7 @@ impl ParallelLVRProcessor {
             return Ok(());
         }
         
-        let writer = self.parquet_writer.lock().await;
-        writer.write_cluster_activity(&self.cluster_activity).await?;
+        self.parquet_writer.write_cluster_activity(&self.cluster_activity).await?;
         
         info!("Successfully persisted cluster activity data");
         Ok(())
@@ -742,37 +794,9 @@ impl ParallelLVRProcessor {
         precomputed_writer.write_distribution_metrics().await?;
         info!("Completed distribution metrics precomputation");
     
+        precomputed_writer.write_manifest().await?;
+    
         info!("Successfully completed all metric precomputations");
         Ok(())
     }
-    
-    fn parse_lvr_details(&self, details_str: &str, target_pool_name: &str) -> Option<f64> {
-        // Attempt to parse as a vector of vectors of strings
-        if let Ok(details) = serde_json::from_str::<Vec<Vec<String>>>(details_str) {
-            for entry in details {
-                if entry.len() == 2 {
-                    let pool_name = &entry[0];
-                    let value_str = &entry[1];
-    
-                    if pool_name == target_pool_name {
-                        // Parse value_str as JSON to extract 'dollarValue'
-                        if let Ok(detail) = serde_json::from_str::<HashMap<String, serde_json::Value>>(value_str) {
-                            if let Some(dollar_value) = detail.get("dollarValue") {
-                                return dollar_value.as_f64();
-                            }
-                        }
-                        // Fall back to parsing value_str as a float
-                        if let Ok(value) = value_str.parse::<f64>() {
-                            return Some(value);
-                        }
-                    }
-                }
-            }
-        } else {
-            // Log the parsing error for debugging
-            error!("Failed to parse details_str as Vec<Vec<String>>");
-        }
-    
-        None
-    }
 }
\ No newline at end of file
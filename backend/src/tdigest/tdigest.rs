@@ -255,13 +255,27 @@ impl TDigest {
 
     /// Returns (q * 100)th percentile value in dollars
     pub fn quantile(&self, q: f64) -> Option<f64> {
-        if q < 0.0 || q > 1.0 || self.centroids.is_empty() {
-            return None;
+        let [value] = self.quantiles([q]);
+        value
+    }
+
+    /// Returns several percentiles at once, sorting the centroids a single time
+    pub fn quantiles<const N: usize>(&self, qs: [f64; N]) -> [Option<f64>; N] {
+        if self.centroids.is_empty() {
+            return [None; N];
         }
 
         let mut sorted_centroids = self.centroids.clone();
         sorted_centroids.sort_by(|a, b| a.mean.partial_cmp(&b.mean).unwrap());
 
+        qs.map(|q| self.quantile_of_sorted(&sorted_centroids, q))
+    }
+
+    fn quantile_of_sorted(&self, sorted_centroids: &[Centroid], q: f64) -> Option<f64> {
+        if q < 0.0 || q > 1.0 {
+            return None;
+        }
+
         let target_weight = q * self.total_weight;
         let mut cumulative_weight = 0.0;
 
@@ -367,6 +367,21 @@ pub mod tests {
         assert_eq!(tdigest.quantile(0.5), Some(42.0), "Single-value TDigest should return that value");
     }
 
+    #[test]
+    fn test_tdigest_quantiles_match_single() {
+        let (data, _) = generate_lognormal_data(1.0, 1.5, 5000);
+        let mut tdigest = TDigest::new();
+        for &x in &data {
+            tdigest.add(x);
+        }
+        tdigest.finalize();
+
+        let qs = [0.25, 0.5, 0.75];
+        for (combined, q) in tdigest.quantiles(qs).into_iter().zip(qs) {
+            assert_eq!(combined, tdigest.quantile(q), "Combined quantile {} should match the single lookup", q);
+        }
+    }
+
     // --- AdaptiveParameters Tests ---
     #[test]
     fn test_adaptive_parameters_initial() {
@@ -643,5 +658,608 @@ pub mod tests {
         assert_eq!(activity.total_blocks(), 3, "Should count 1 from first chunk + 2 from second chunk");
         assert_eq!(activity.non_zero_blocks(), 2, "Should count 0 from first chunk + 2 from second chunk");
     }
-}
 
+    #[test]
+    fn test_process_range_matches_process_block() {
+        let mut per_block = ClusterBlockActivity::new(
+            "Test Cluster".to_string(),
+            MarkoutTime::Zero,
+            1000,
+            10  // Small size so the ranges cross a reset
+        );
+        let mut ranged = ClusterBlockActivity::new(
+            "Test Cluster".to_string(),
+            MarkoutTime::Zero,
+            1000,
+            10
+        );
+        
+        let non_zero = [1003, 1012, 1013, 1031];
+        for block in 995..1035 {
+            per_block.process_block(block, non_zero.contains(&block));
+        }
+        
+        let mut next_block = 995;
+        for &block in &non_zero {
+            ranged.process_range(next_block, block);
+            ranged.process_block(block, true);
+            next_block = block + 1;
+        }
+        ranged.process_range(next_block, 1035);
+        
+        assert_eq!(ranged.total_blocks(), per_block.total_blocks(), "Total blocks should match per-block processing");
+        assert_eq!(ranged.non_zero_blocks(), per_block.non_zero_blocks(), "Non-zero blocks should match per-block processing");
+        
+        // Blocks before the base block are ignored
+        ranged.process_range(900, 950);
+        assert_eq!(ranged.total_blocks(), per_block.total_blocks(), "Blocks before the base should be ignored");
+    }
+
+    // Per-block reference: map every block in the effective range to its interval,
+    // defaulting missing blocks to zero, then aggregate each interval's blocks
+    fn per_block_interval_metrics(
+        chunk_start: u64,
+        chunk_end: u64,
+        deployment_block: u64,
+        data: &[UnifiedLVRData],
+    ) -> Vec<(u64, u64, u64, u64, u64)> {
+        use std::collections::{BTreeMap, HashMap};
+        
+        let blocks_per_interval = 7200;
+        let effective_chunk_start = chunk_start.max(deployment_block);
+        if effective_chunk_start >= chunk_end {
+            return Vec::new();
+        }
+        
+        let mut block_data = HashMap::new();
+        for point in data {
+            if point.block_number >= effective_chunk_start && point.block_number < chunk_end {
+                block_data.insert(point.block_number, point.lvr_cents);
+            }
+        }
+        
+        let mut interval_groups: BTreeMap<u64, Vec<(u64, u64)>> = BTreeMap::new();
+        for block_number in effective_chunk_start..chunk_end {
+            let interval_id = (block_number - chunk_start) / blocks_per_interval;
+            let value = block_data.get(&block_number).copied().unwrap_or(0);
+            interval_groups.entry(interval_id).or_default().push((block_number, value));
+        }
+        
+        interval_groups
+            .into_iter()
+            .map(|(interval_id, blocks)| {
+                let interval_start = chunk_start + (interval_id * blocks_per_interval);
+                let interval_end = (interval_start + blocks_per_interval).min(chunk_end);
+                let effective_interval_start = interval_start.max(deployment_block);
+                let total_count = if effective_interval_start >= interval_end {
+                    0
+                } else {
+                    blocks.iter()
+                        .filter(|(block_number, _)| *block_number >= effective_interval_start)
+                        .count() as u64
+                };
+                let non_zero_values: Vec<u64> = blocks.iter()
+                    .filter(|(block_number, value)| *block_number >= effective_interval_start && *value > 0)
+                    .map(|(_, value)| *value)
+                    .collect();
+                (
+                    interval_id,
+                    non_zero_values.iter().sum(),
+                    non_zero_values.iter().copied().max().unwrap_or(0),
+                    non_zero_values.len() as u64,
+                    total_count,
+                )
+            })
+            .collect()
+    }
+
+    #[test]
+    fn test_interval_metrics_matches_per_block() {
+        let mut rng = thread_rng();
+        let chunk_start = 1_000_000;
+        // Three full intervals plus a partial final one
+        let chunk_end = chunk_start + 3 * 7200 + 1234;
+        
+        let mut data: Vec<UnifiedLVRData> = (0..2000)
+            .map(|_| UnifiedLVRData {
+                // Includes points on both sides of the chunk
+                block_number: rng.gen_range(chunk_start - 100..chunk_end + 100),
+                lvr_cents: if rng.gen_bool(0.5) { 0 } else { rng.gen_range(1..100_000) },
+                source: DataSource::Aurora,
+            })
+            .collect();
+        // Repeated blocks, where the last value reported should win
+        for i in 0..50 {
+            let block_number = data[i].block_number;
+            data.push(UnifiedLVRData {
+                block_number,
+                lvr_cents: rng.gen_range(0..100_000),
+                source: DataSource::Aurora,
+            });
+        }
+        
+        let deployment_blocks = [
+            0,                              // Deployed before the chunk
+            chunk_start + 5000,             // Mid first interval
+            chunk_start + 2 * 7200,         // On an interval boundary
+            chunk_start + 3 * 7200 + 17,    // Inside the partial final interval
+            chunk_end + 10,                 // After the chunk
+        ];
+        for deployment_block in deployment_blocks {
+            let expected = per_block_interval_metrics(chunk_start, chunk_end, deployment_block, &data);
+            let actual: Vec<_> = interval_metrics(
+                chunk_start,
+                chunk_end,
+                deployment_block,
+                "0xtest",
+                MarkoutTime::Zero,
+                &data,
+            )
+                .into_iter()
+                .map(|interval| (
+                    interval.interval_id,
+                    interval.total_lvr_cents,
+                    interval.max_lvr_cents,
+                    interval.non_zero_count,
+                    interval.total_count,
+                ))
+                .collect();
+            
+            assert_eq!(actual, expected,
+                "Interval metrics should match per-block processing for deployment block {}", deployment_block);
+        }
+        
+        // Intervals without any data points are still emitted with zero LVR
+        let empty = interval_metrics(chunk_start, chunk_end, 0, "0xtest", MarkoutTime::Zero, &[]);
+        assert_eq!(empty.len(), 4, "Every interval in the chunk should be emitted");
+        assert!(empty.iter().all(|interval| interval.non_zero_count == 0 && interval.total_lvr_cents == 0));
+        assert_eq!(empty.last().unwrap().total_count, 1234, "Final interval should count only its partial blocks");
+    }
+
+    #[test]
+    fn test_zero_filled_blocks_matches_lookup_fill() {
+        let mut rng = thread_rng();
+        let chunk_start = 5_000;
+        let chunk_end = 5_500;
+        
+        // Unsorted events with gaps, including repeated blocks with different values
+        let mut events: Vec<UnifiedLVRData> = (0..150)
+            .map(|_| UnifiedLVRData {
+                block_number: rng.gen_range(chunk_start..chunk_end),
+                lvr_cents: rng.gen_range(1..100_000),
+                source: DataSource::Brontes,
+            })
+            .collect();
+        for i in 0..20 {
+            let block_number = events[i].block_number;
+            events.push(UnifiedLVRData {
+                block_number,
+                lvr_cents: rng.gen_range(1..100_000),
+                source: DataSource::Brontes,
+            });
+        }
+        
+        // Reference: sort stably, then look up the first event for every block
+        let mut sorted = events.clone();
+        sorted.sort_by_key(|event| event.block_number);
+        let expected: Vec<(u64, u64)> = (chunk_start..chunk_end)
+            .map(|block| {
+                let lvr_cents = sorted.iter()
+                    .find(|event| event.block_number == block)
+                    .map_or(0, |event| event.lvr_cents);
+                (block, lvr_cents)
+            })
+            .collect();
+        
+        let filled = zero_filled_blocks(chunk_start, chunk_end, events);
+        let actual: Vec<(u64, u64)> = filled.iter()
+            .map(|entry| (entry.block_number, entry.lvr_cents))
+            .collect();
+        assert_eq!(actual, expected, "Zero fill should match the per-block lookup, first event winning");
+        assert!(filled.iter().all(|entry| entry.source == DataSource::Brontes));
+        
+        // No events gives a full run of zeros
+        let empty = zero_filled_blocks(chunk_start, chunk_end, Vec::new());
+        assert_eq!(empty.len(), (chunk_end - chunk_start) as usize);
+        assert!(empty.iter().all(|entry| entry.lvr_cents == 0));
+    }
+
+    // Reference: the value one pool took when each payload was parsed per pool
+    fn per_pool_lvr_details(details_str: &str, target_pool_name: &str) -> Option<f64> {
+        use std::collections::HashMap;
+        
+        let details = serde_json::from_str::<Vec<Vec<String>>>(details_str).ok()?;
+        for entry in details {
+            if entry.len() == 2 && entry[0] == target_pool_name {
+                if let Ok(detail) = serde_json::from_str::<HashMap<String, serde_json::Value>>(&entry[1]) {
+                    if let Some(dollar_value) = detail.get("dollarValue") {
+                        return dollar_value.as_f64();
+                    }
+                }
+                if let Ok(value) = entry[1].parse::<f64>() {
+                    return Some(value);
+                }
+            }
+        }
+        None
+    }
+
+    #[test]
+    fn test_parse_lvr_details_matches_per_pool() {
+        use std::collections::HashMap;
+        
+        let pool_names = ["POOL-A", "POOL-B", "POOL-C", "POOL-D", "POOL-E"];
+        let pool_indices: HashMap<&str, usize> = pool_names.iter()
+            .enumerate()
+            .map(|(idx, &name)| (name, idx))
+            .collect();
+        
+        let details = serde_json::to_string(&vec![
+            vec!["POOL-A", r#"{"dollarValue": 1.5}"#],
+            vec!["POOL-A", r#"{"dollarValue": 9.0}"#],     // Later entry for a decided pool
+            vec!["POOL-B", r#"{"dollarValue": "12.5"}"#],  // Non-numeric dollarValue decides B with no value
+            vec!["POOL-B", "3.0"],
+            vec!["UNKNOWN", "5.0"],                         // Not a tracked pool
+            vec!["POOL-C", r#"{"other": 1}"#],              // No dollarValue and not a number, skipped
+            vec!["POOL-C", "42"],                           // Integer text falls back to float
+            vec!["POOL-D"],                                 // Malformed entry
+            vec!["POOL-D", r#"{"dollarValue": 7}"#],        // Integer dollarValue
+            vec!["POOL-E", "not a number"],
+        ]).unwrap();
+        
+        let mut calls = Vec::new();
+        parse_lvr_details(&details, &pool_indices, |idx, value| calls.push((idx, value)));
+        assert_eq!(calls, vec![(0, 1.5), (2, 42.0), (3, 7.0)],
+            "Each pool should be reported once, in payload order");
+        
+        for (idx, name) in pool_names.iter().enumerate() {
+            let reported = calls.iter().find(|&&(call_idx, _)| call_idx == idx).map(|&(_, value)| value);
+            assert_eq!(reported, per_pool_lvr_details(&details, name),
+                "Value for {} should match per-pool parsing", name);
+        }
+        
+        // An unparseable payload reports nothing
+        let mut calls = Vec::new();
+        parse_lvr_details("not json", &pool_indices, |idx, value| calls.push((idx, value)));
+        assert!(calls.is_empty(), "Malformed payload should report no values");
+    }
+
+    #[test]
+    fn test_response_cache_epochs() {
+        use bytes::Bytes;
+        use crate::api::cache::ResponseCache;
+        
+        let cache = ResponseCache::new();
+        let epoch = cache.epoch();
+        cache.insert("/a".to_string(), Bytes::from_static(b"first"), epoch);
+        assert_eq!(cache.get("/a").map(|(body, _)| body), Some(Bytes::from_static(b"first")));
+        
+        // An entry left from an earlier epoch is a miss, not stale data
+        cache.advance_epoch();
+        assert!(cache.get("/a").is_none(), "Entry from an older epoch should not be served");
+        
+        // A response built before a clear is not stored
+        let before_clear = cache.epoch();
+        cache.clear();
+        cache.insert("/b".to_string(), Bytes::from_static(b"stale"), before_clear);
+        assert!(cache.get("/b").is_none(), "Insert from a replaced epoch should be skipped");
+        
+        // The ETag is still returned so the response can carry it
+        let etag = cache.insert("/b".to_string(), Bytes::from_static(b"fresh"), before_clear);
+        assert!(!etag.is_empty());
+        cache.insert("/b".to_string(), Bytes::from_static(b"fresh"), cache.epoch());
+        assert_eq!(cache.get("/b").map(|(_, tag)| tag), Some(etag), "ETag should depend only on the body");
+    }
+
+    #[test]
+    fn test_response_cache_evicts_least_recently_used() {
+        use bytes::Bytes;
+        use crate::api::cache::ResponseCache;
+        
+        // Entry limit
+        let cache = ResponseCache::with_limits(2, 1024);
+        let epoch = cache.epoch();
+        cache.insert("/a".to_string(), Bytes::from_static(b"a"), epoch);
+        cache.insert("/b".to_string(), Bytes::from_static(b"b"), epoch);
+        assert!(cache.get("/a").is_some());
+        cache.insert("/c".to_string(), Bytes::from_static(b"c"), epoch);
+        assert!(cache.get("/a").is_some(), "Recently used entry should survive");
+        assert!(cache.get("/b").is_none(), "Least recently used entry should be evicted");
+        assert!(cache.get("/c").is_some(), "New entry should be cached");
+        
+        // Replacing a key reuses its slot instead of evicting another entry
+        cache.insert("/c".to_string(), Bytes::from_static(b"c2"), epoch);
+        assert!(cache.get("/a").is_some() && cache.get("/c").is_some());
+        
+        // Byte limit
+        let cache = ResponseCache::with_limits(16, 10);
+        let epoch = cache.epoch();
+        cache.insert("/a".to_string(), Bytes::from_static(b"aaaaaa"), epoch);
+        cache.insert("/b".to_string(), Bytes::from_static(b"bbbb"), epoch);
+        assert!(cache.get("/a").is_some() && cache.get("/b").is_some(), "Both fit in the byte limit");
+        cache.insert("/c".to_string(), Bytes::from_static(b"cc"), epoch);
+        assert!(cache.get("/a").is_none(), "Oldest entry should make room for new bytes");
+        assert!(cache.get("/b").is_some() && cache.get("/c").is_some());
+        
+        // A body larger than the whole budget is not cached and evicts nothing
+        cache.insert("/big".to_string(), Bytes::from(vec![0u8; 11]), epoch);
+        assert!(cache.get("/big").is_none(), "Oversized body should not be cached");
+        assert!(cache.get("/b").is_some() && cache.get("/c").is_some());
+    }
+
+    #[test]
+    fn test_etag_matches_if_none_match() {
+        use axum::http::HeaderValue;
+        use crate::api::cache::etag_matches;
+        
+        let etag = HeaderValue::from_static("\"0123456789abcdef\"");
+        let check = |if_none_match: &'static str| etag_matches(Some(&HeaderValue::from_static(if_none_match)), &etag);
+        
+        assert!(check("\"0123456789abcdef\""), "Identical tag should match");
+        assert!(!check("\"fedcba9876543210\""), "Different tag should not match");
+        assert!(!check("0123456789abcdef"), "Unquoted tag should not match");
+        assert!(check("W/\"0123456789abcdef\""), "Weak form of the tag should match");
+        assert!(check("\"fedcba9876543210\", W/\"0123456789abcdef\""), "Tag later in a list should match");
+        assert!(check("\"0123456789abcdef\",\"fedcba9876543210\""), "Tag in a list without spaces should match");
+        assert!(!check("\"fedcba9876543210\", \"aaaaaaaaaaaaaaaa\""), "List without the tag should not match");
+        assert!(check("*"), "Wildcard should match any tag");
+        assert!(!check(""), "Empty header should not match");
+        assert!(!etag_matches(None, &etag), "Missing header should not match");
+    }
+
+    #[tokio::test]
+    async fn test_cache_responses_conditional_requests() {
+        use std::sync::{atomic::{AtomicUsize, Ordering}, Arc};
+        use axum::{
+            body::{self, Body},
+            http::{header, Request, StatusCode},
+            middleware,
+            routing::get,
+            Router,
+        };
+        use tower::ServiceExt;
+        use crate::api::cache::cache_responses;
+        
+        let state = Arc::new(AppState::new(Arc::new(object_store::memory::InMemory::new())));
+        let calls = Arc::new(AtomicUsize::new(0));
+        let handler_calls = calls.clone();
+        let app = Router::new()
+            .route("/data", get(move || {
+                let calls = handler_calls.clone();
+                async move {
+                    calls.fetch_add(1, Ordering::SeqCst);
+                    "{\"value\":1}"
+                }
+            }).post(|| async { "posted" }))
+            .route_layer(middleware::from_fn_with_state(state.clone(), cache_responses))
+            .with_state(state.clone());
+        
+        let request = |method: &str, if_none_match: Option<&header::HeaderValue>| {
+            let mut builder = Request::builder().method(method).uri("/data");
+            if let Some(etag) = if_none_match {
+                builder = builder.header(header::IF_NONE_MATCH, etag.clone());
+            }
+            builder.body(Body::empty()).unwrap()
+        };
+        
+        // First request fills the cache and carries an ETag
+        let response = app.clone().oneshot(request("GET", None)).await.unwrap();
+        assert_eq!(response.status(), StatusCode::OK);
+        let etag = response.headers().get(header::ETAG).cloned().expect("Response should carry an ETag");
+        let body = body::to_bytes(response.into_body(), usize::MAX).await.unwrap();
+        assert_eq!(&body[..], b"{\"value\":1}");
+        assert_eq!(calls.load(Ordering::SeqCst), 1);
+        
+        // Cache hit with a matching tag: 304 without a body or another handler run
+        let response = app.clone().oneshot(request("GET", Some(&etag))).await.unwrap();
+        assert_eq!(response.status(), StatusCode::NOT_MODIFIED);
+        assert_eq!(response.headers().get(header::ETAG), Some(&etag));
+        assert!(body::to_bytes(response.into_body(), usize::MAX).await.unwrap().is_empty());
+        assert_eq!(calls.load(Ordering::SeqCst), 1, "Cached response should not rerun the handler");
+        
+        // Cache hit with a different tag: full body from the cache
+        let stale = header::HeaderValue::from_static("\"0000000000000000\"");
+        let response = app.clone().oneshot(request("GET", Some(&stale))).await.unwrap();
+        assert_eq!(response.status(), StatusCode::OK);
+        assert_eq!(response.headers().get(header::ETAG), Some(&etag));
+        assert_eq!(&body::to_bytes(response.into_body(), usize::MAX).await.unwrap()[..], b"{\"value\":1}");
+        assert_eq!(calls.load(Ordering::SeqCst), 1);
+        
+        // Freshly filled entry whose body is unchanged: handler runs, client still gets 304
+        state.responses.clear();
+        let response = app.clone().oneshot(request("GET", Some(&etag))).await.unwrap();
+        assert_eq!(response.status(), StatusCode::NOT_MODIFIED);
+        assert_eq!(calls.load(Ordering::SeqCst), 2, "Cleared cache should rerun the handler");
+        
+        // Non-GET requests pass straight through, uncached and untagged
+        let response = app.clone().oneshot(request("POST", Some(&etag))).await.unwrap();
+        assert_eq!(response.status(), StatusCode::OK);
+        assert!(response.headers().get(header::ETAG).is_none(), "POST should not be tagged");
+        assert_eq!(&body::to_bytes(response.into_body(), usize::MAX).await.unwrap()[..], b"posted");
+    }
+
+    #[test]
+    fn test_running_total_columns_match_rows() {
+        use crate::api::{RunningTotal, RunningTotalColumns};
+        use serde_json::Value;
+        
+        let pool_rows = || vec![
+            RunningTotal {
+                block_number: 100,
+                markout: "brontes".to_string(),
+                pool_name: Some("WETH/USDC".to_string()),
+                pool_address: Some("0xaaa".to_string()),
+                running_total_cents: 5,
+            },
+            RunningTotal {
+                block_number: 100,
+                markout: "0.0".to_string(),
+                pool_name: Some("WBTC/WETH".to_string()),
+                pool_address: Some("0xbbb".to_string()),
+                running_total_cents: 7,
+            },
+            RunningTotal {
+                block_number: 200,
+                markout: "brontes".to_string(),
+                pool_name: Some("WETH/USDC".to_string()),
+                pool_address: Some("0xaaa".to_string()),
+                running_total_cents: 12,
+            },
+        ];
+        let aggregate_rows = || vec![
+            RunningTotal {
+                block_number: 100,
+                markout: "brontes".to_string(),
+                pool_name: None,
+                pool_address: None,
+                running_total_cents: 5,
+            },
+            RunningTotal {
+                block_number: 200,
+                markout: "brontes".to_string(),
+                pool_name: None,
+                pool_address: None,
+                running_total_cents: 12,
+            },
+        ];
+        
+        // Rebuilds row objects from the columns, the way a client zips them back up
+        let zip_columns = |columns: &Value| -> Vec<Value> {
+            let column = |name: &str| columns.get(name).and_then(Value::as_array).cloned();
+            let blocks = column("block_number").expect("block_number column");
+            (0..blocks.len())
+                .map(|i| {
+                    let cell = |name: &str| column(name).map_or(Value::Null, |values| values[i].clone());
+                    serde_json::json!({
+                        "block_number": cell("block_number"),
+                        "markout": cell("markout"),
+                        "pool_name": cell("pool_name"),
+                        "pool_address": cell("pool_address"),
+                        "running_total_cents": cell("running_total_cents"),
+                    })
+                })
+                .collect()
+        };
+        
+        for rows in [pool_rows, aggregate_rows] {
+            let expected = serde_json::to_value(rows()).unwrap();
+            let columns = RunningTotalColumns::from(rows());
+            let len = expected.as_array().unwrap().len();
+            
+            assert_eq!(columns.block_number.len(), len);
+            assert_eq!(columns.markout.len(), len);
+            assert_eq!(columns.running_total_cents.len(), len);
+            
+            let columns = serde_json::to_value(&columns).unwrap();
+            assert_eq!(Value::Array(zip_columns(&columns)), expected, "format=columns should carry the same data as format=rows");
+        }
+        
+        // Aggregate series drop the pool columns instead of sending arrays of nulls
+        let columns = RunningTotalColumns::from(aggregate_rows());
+        assert!(columns.pool_name.is_none() && columns.pool_address.is_none());
+        let columns = serde_json::to_value(&columns).unwrap();
+        assert!(columns.get("pool_name").is_none() && columns.get("pool_address").is_none());
+        
+        let columns = RunningTotalColumns::from(pool_rows());
+        assert_eq!(columns.pool_name.as_ref().map(Vec::len), Some(3));
+        assert_eq!(columns.pool_address.as_ref().map(Vec::len), Some(3));
+        
+        let columns = serde_json::to_value(RunningTotalColumns::from(Vec::new())).unwrap();
+        assert_eq!(columns, serde_json::json!({"block_number": [], "markout": [], "running_total_cents": []}));
+    }
+
+    #[test]
+    fn test_block_range_rows_matches_linear_filter() {
+        use crate::api::running_total::block_range_rows;
+        
+        // Row range the per-row filter used to select, as (first, end) of the matches
+        let linear_range = |blocks: &[u64], start_block: u64, end_block: u64| -> (usize, usize) {
+            let rows: Vec<usize> = blocks
+                .iter()
+                .enumerate()
+                .filter(|(_, &block)| block >= start_block && block <= end_block)
+                .map(|(row, _)| row)
+                .collect();
+            match (rows.first(), rows.last()) {
+                (Some(&first), Some(&last)) => (first, last + 1),
+                _ => (0, 0),
+            }
+        };
+        let row_count = |(first_row, end_row): (usize, usize)| end_row - first_row;
+        
+        let blocks = [10, 20, 20, 30, 40, 40, 40, 50];
+        let cases = [
+            (10, 50),  // exactly the full range
+            (20, 40),  // bounds on duplicated blocks
+            (15, 45),  // bounds between blocks
+            (20, 20),  // single block
+            (21, 29),  // between two blocks, no rows
+            (0, 5),    // entirely before the data
+            (60, 100), // entirely after the data
+            (0, 25),   // starts before the data
+            (35, 100), // ends after the data
+            (0, u64::MAX),
+            (40, 20),  // start after end
+        ];
+        for (start_block, end_block) in cases {
+            let expected = linear_range(&blocks, start_block, end_block);
+            let (first_row, end_row) = block_range_rows(&blocks, start_block, end_block);
+            assert!(first_row <= end_row && end_row <= blocks.len(), "Range {}..={} out of bounds", start_block, end_block);
+            assert_eq!(row_count((first_row, end_row)), row_count(expected), "Row count for {}..={}", start_block, end_block);
+            if row_count(expected) > 0 {
+                assert_eq!((first_row, end_row), expected, "Rows for {}..={}", start_block, end_block);
+            }
+        }
+        
+        assert_eq!(block_range_rows(&[], 0, 100), (0, 0), "Empty column should select no rows");
+        
+        let mut rng = thread_rng();
+        for _ in 0..100 {
+            let mut blocks: Vec<u64> = (0..rng.gen_range(0..50)).map(|_| rng.gen_range(0..100)).collect();
+            blocks.sort_unstable();
+            let start_block = rng.gen_range(0..110);
+            let end_block = rng.gen_range(0..110);
+            
+            let (first_row, end_row) = block_range_rows(&blocks, start_block, end_block);
+            let selected = &blocks[first_row..end_row];
+            let filtered: Vec<u64> = blocks.iter().copied().filter(|&block| block >= start_block && block <= end_block).collect();
+            assert_eq!(selected, &filtered[..], "Blocks for {}..={} in {:?}", start_block, end_block, blocks);
+        }
+    }
+
+    #[test]
+    fn test_unweighted_percentile_matches_sorted() {
+        let mut rng = thread_rng();
+        
+        for len in [1usize, 2, 3, 10, 101, 1000] {
+            let values: Vec<u64> = (0..len).map(|_| rng.gen_range(0..10_000)).collect();
+            let mut sorted = values.clone();
+            sorted.sort_unstable();
+            
+            for percentile in [0u64, 25, 50, 75, 100] {
+                let rank = (percentile as f64 / 100.0) * (len - 1) as f64;
+                let i = rank.floor() as usize;
+                let fraction = rank - i as f64;
+                let expected = if i + 1 >= len {
+                    sorted[i] as f64 / 100.0
+                } else {
+                    (sorted[i] as f64 * (1.0 - fraction) + sorted[i + 1] as f64 * fraction) / 100.0
+                };
+                
+                let actual = api::precompute::PrecomputedWriter::calculate_unweighted_percentile(&values, percentile);
+                assert!((actual - expected).abs() < 1e-9,
+                    "Percentile {} of {} values should be {}, got {}", percentile, len, expected, actual);
+            }
+        }
+        
+        let values: Vec<u64> = (0..257).map(|_| rng.gen_range(0..10_000)).collect();
+        let combined = api::precompute::PrecomputedWriter::calculate_unweighted_percentiles(&values, [25, 50, 50, 75]);
+        for (&actual, percentile) in combined.iter().zip([25u64, 50, 50, 75]) {
+            let expected = api::precompute::PrecomputedWriter::calculate_unweighted_percentile(&values, percentile);
+            assert!((actual - expected).abs() < 1e-9,
+                "Combined percentile {} should match the single lookup", percentile);
+        }
+        
+        assert_eq!(api::precompute::PrecomputedWriter::calculate_unweighted_percentile(&[], 50), 0.0, "Empty input should yield 0");
+    }
+}
@@ -1,8 +1,15 @@
 use tracing_subscriber;
 
+/// Installs the global subscriber. The level comes from `LOG_LEVEL` (e.g. `warn` in
+/// production to skip the per-request info lines) and defaults to `info`.
 pub fn init_logging() {
+    let level = std::env::var("LOG_LEVEL")
+        .ok()
+        .and_then(|level| level.parse::<tracing::Level>().ok())
+        .unwrap_or(tracing::Level::INFO);
+
     tracing_subscriber::fmt()
-        .with_max_level(tracing::Level::INFO)
+        .with_max_level(level)
         .with_target(false)
         .with_thread_ids(true)
         .with_file(true)
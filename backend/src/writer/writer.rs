@@ -48,7 +48,7 @@ impl ParallelParquetWriter {
     }
 
     pub async fn write_interval_data(
-        &mut self,
+        &self,
         mut interval_data: Vec<IntervalData>,
         chunk_start: u64,
         chunk_end: u64,
@@ -76,7 +76,7 @@ impl ParallelParquetWriter {
     }
 
     pub async fn write_checkpoints(
-        &mut self,
+        &self,
         checkpoints: Vec<CheckpointSnapshot>
     ) -> Result<()> {
         debug!("Acquiring semaphore for checkpoint writes...");